@@ -0,0 +1,80 @@
+import os
+import shutil
+import subprocess
+import sys
+from functools import lru_cache
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+# Where Streamlit serves STATIC_DIR when server.enableStaticServing is on
+STATIC_URL = "app/static"
+
+ALARM_SOURCE = "mixkit-classic-alarm-995.wav"
+
+# Compressed encodings of the alarm, preferred in this order when present in STATIC_DIR
+ALARM_ENCODINGS = (
+    ("mixkit-classic-alarm-995.ogg", "audio/ogg", ["-c:a", "libopus", "-b:a", "32k"]),
+    ("mixkit-classic-alarm-995.mp3", "audio/mpeg", ["-c:a", "libmp3lame", "-b:a", "64k"]),
+)
+
+
+# Function to find the alarm file to serve, looked up once per process
+@lru_cache(maxsize=None)
+def alarm_asset():
+    """
+    Return the URL and MIME type of the alarm sound.
+
+    A pre-encoded compressed file is used when one exists, otherwise the original WAV.
+
+    Returns:
+        tuple[str, str]: The URL relative to the app and the MIME type.
+    """
+    for file_name, mime_type, _ in ALARM_ENCODINGS:
+        if os.path.exists(os.path.join(STATIC_DIR, file_name)):
+            return f"{STATIC_URL}/{file_name}", mime_type
+    return f"{STATIC_URL}/{ALARM_SOURCE}", "audio/wav"
+
+
+# Function to build the HTML that plays the alarm once
+def alarm_html(alert_id):
+    """
+    Return an autoplaying audio tag that references the static alarm file.
+
+    The page only receives this tag, a few hundred bytes; the browser fetches the sound
+    once and then serves it from its cache.
+
+    Args:
+        alert_id (str | int): A value unique to the alert, so Streamlit mounts a new element
+            and the sound plays again even if the previous alert is still on the page.
+    """
+    url, mime_type = alarm_asset()
+    return f'<audio autoplay="true" data-alert="{alert_id}"><source src="{url}" type="{mime_type}"></audio>'
+
+
+# Function to pre-encode the alarm into the compressed formats with ffmpeg
+def encode_alarm():
+    """
+    Write every encoding of ALARM_ENCODINGS next to the WAV. Needs ffmpeg on the PATH.
+
+    Returns:
+        list[str]: The files written.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg was not found on the PATH.")
+    source = os.path.join(STATIC_DIR, ALARM_SOURCE)
+    written = []
+    for file_name, _, codec_args in ALARM_ENCODINGS:
+        target = os.path.join(STATIC_DIR, file_name)
+        subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-i", source, "-ac", "1", *codec_args, target], check=True)
+        written.append(target)
+    alarm_asset.cache_clear()
+    return written
+
+
+if __name__ == "__main__":
+    try:
+        for path in encode_alarm():
+            print(f"{path}: {os.path.getsize(path) / 1024:.0f} KB")
+    except (RuntimeError, subprocess.CalledProcessError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
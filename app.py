@@ -1,391 +1,41 @@
 import streamlit as st
-import requests
-from lxml import etree
 from datetime import datetime, timedelta
+import streamlit.components.v1 as components
+import os
 import time
-import xml.etree.ElementTree as ET
-import numpy as np
-import pytz
-import base64
+from alarm_audio import alarm_html
+from damas.dispatch_service import load_dispatch_data, start_dispatch_poller, today_and_tomorrow
+from damas.metrics import REGISTRY, span, start_metrics_export, summary_records
+from table_view import render_records, render_schedule
 
 # Set the page title
 st.set_page_config(page_title="Client Web Service Damas", layout="wide")
 
-# Fetching credentials from Streamlit secrets
-ACCESS_CODE_1 = st.secrets["ACCESS_CODE_1"]
-ACCESS_CODE_2 = st.secrets["ACCESS_CODE_2"]
-
-def autoplay_audio(file_path: str):
-    try:
-        with open(file_path, "rb") as f:
-            data = f.read()
-            b64 = base64.b64encode(data).decode()
-            md = f"""
-                <audio autoplay="true">
-                <source src="data:audio/wav;base64,{b64}" type="audio/wav">
-                </audio>
-                """
-            st.markdown(md, unsafe_allow_html=True)
-    except FileNotFoundError:
-        print("Audio file not found. Please ensure the file exists.")
-
-# Function to get the current timestamp
-def get_current_timestamp():
-    now = datetime.utcnow()
-    expires = now + timedelta(hours=1)
-    return now.strftime("%Y-%m-%dT%H:%M:%SZ"), expires.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-def convert_utc_to_eet(utc_time_str):
-    # Remove the 'Z' if present
-    if utc_time_str.endswith('Z'):
-        utc_time_str = utc_time_str[:-1]
-    # Try parsing with both possible formats
-    try:
-        utc_time = datetime.strptime(utc_time_str, "%Y-%m-%dT%H:%M:%S")
-    except ValueError:
-        try:
-            utc_time = datetime.strptime(utc_time_str, "%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            utc_time = datetime.strptime(utc_time_str, "%Y-%m-%dT%H:%M")
-    # Convert to EET (UTC+2) and account for daylight saving (UTC+3 during summer)
-    eet_time = utc_time + timedelta(hours=3 if (utc_time.month >= 4 and utc_time.month < 11) else 2)
-    return eet_time.strftime("%Y-%m-%d %H:%M:%S")
-
-# Function to send SOAP request for Generation Schedule
-def get_generation_schedule(date_from, date_to):
-    created, expires = get_current_timestamp()
-
-    # SOAP request XML
-    soap_request = f"""
-    <soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope" xmlns:wse="http://markets.transelectrica.ro/wse">
-        <soap:Header>
-            <wsse:Security soap:mustUnderstand="true" xmlns:wsse="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd" xmlns:wsu="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-utility-1.0.xsd">
-                <wsse:UsernameToken wsu:Id="username_token_id">
-                    <wsse:Username>{ACCESS_CODE_1}</wsse:Username>
-                    <wsse:Password Type="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-username-token-profile-1.0#PasswordText">{ACCESS_CODE_2}</wsse:Password>
-                </wsse:UsernameToken>
-                <wsu:Timestamp wsu:Id="timestamp_id">
-                    <wsu:Created>{created}</wsu:Created>
-                    <wsu:Expires>{expires}</wsu:Expires>
-                </wsu:Timestamp>
-            </wsse:Security>
-        </soap:Header>
-        <soap:Body>
-            <wse:RunSynchronous>
-                <wse:Input>
-                    <wse:FID>GENERATION_SCHEDULES_MANUAL_DOWNLOAD_XML_OUT</wse:FID>
-                    <wse:Parameters>
-                        <wse:DateParam Name="DateFrom">{date_from}</wse:DateParam>
-                        <wse:DateParam Name="DateTo">{date_to}</wse:DateParam>
-                    </wse:Parameters>
-                </wse:Input>
-            </wse:RunSynchronous>
-        </soap:Body>
-    </soap:Envelope>
-    """
-
-    headers = {
-        'Content-Type': 'application/soap+xml;charset=UTF-8;action="http://markets.transelectrica.ro/wse/RunSynchronous"',
-    }
-
-    # Send the SOAP request
-    response = requests.post(
-        "https://newmarkets.transelectrica.ro/usy-durom-wsendpointg01/00121002300000000000000000000100/ws",
-        data=soap_request,
-        headers=headers
-    )
-
-    if response.status_code == 200:
-        return response.content
-    else:
-        print(f"Error: {response.status_code}, {response.text}")
-        return None
+# st.fragment is still experimental in older Streamlit releases
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
 
+# Seconds between two reads of the poller snapshot by a session
+SNAPSHOT_CHECK_INTERVAL = 10
 
-def parse_generation_schedule(response_schedule, date_from):
-    """
-    Parse the generation schedule XML response and create a structured schedule.
-
-    Args:
-        response_schedule (str): The XML response as a string.
-        date_from (datetime.date): The starting date for the schedule.
-
-    Returns:
-        list[dict]: The parsed generation schedule.
-    """
-    import xml.etree.ElementTree as ET
-    from datetime import datetime, timedelta
-
-    # Parse the XML response
-    try:
-        root_schedule = ET.fromstring(response_schedule)
-    except ET.ParseError as e:
-        print("XML Parse Error:", e)
-        return []
-
-    # Define namespaces
-    namespaces = {
-        "soap": "http://www.w3.org/2003/05/soap-envelope",
-        "ns1": "http://markets.transelectrica.ro/wse"
-    }
-
-    print("Root Element:", root_schedule.tag)
-
-    # Locate the schedule intervals
-    intervals = root_schedule.findall(".//ns1:Interval", namespaces=namespaces)
-    print("Matched Intervals Count:", len(intervals))
-
-    if not intervals:
-        print("No intervals found in the XML. Check namespaces or structure.")
-        return []
-
-    # Process intervals into a structured schedule
-    generation_schedule = []
-    for interval in intervals:
-        print("Interval Element:", ET.tostring(interval, encoding="unicode"))
-
-        pos_elem = interval.find("ns1:Pos", namespaces=namespaces)
-        qty_elem = interval.find("ns1:Qty", namespaces=namespaces)
-
-        if pos_elem is None or qty_elem is None:
-            print("Missing 'Pos' or 'Qty' in Interval. Skipping.")
-            continue
-
-        # Retrieve attributes instead of text
-        position = pos_elem.get("v")
-        quantity = qty_elem.get("v")
-
-        try:
-            position = int(position)
-            quantity = float(quantity)
-        except (ValueError, TypeError) as e:
-            print(f"Error parsing Pos or Qty: {e}")
-            continue
-
-        # Calculate time intervals
-        initial_start_time = datetime.combine(date_from, datetime.min.time())  # Adjust for EET
-        start_time = initial_start_time + timedelta(minutes=15 * (position - 1))
-        end_time = start_time + timedelta(minutes=15)
+# With the socket of a running monitor.py, the page follows its events instead of polling DAMAS
+MONITOR_SOCKET = os.environ.get("DAMAS_MONITOR_SOCKET")
 
-        generation_schedule.append({
-            "Ora de Inceput": start_time.strftime("%Y-%m-%d %H:%M:%S"),
-            "Ora de Sfarsit": end_time.strftime("%Y-%m-%d %H:%M:%S"),
-            "Punct de bază [MW]": quantity,
-            "Bandă reglare [MW]": 0
-        })
-
-    return generation_schedule
-
-
-# Function to convert a time to UTC string format
-def to_utc_string(dt):
-    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-# Function to simulate generation schedule response
-def get_generation_schedule_manually():
-    eet_timezone = pytz.timezone('Europe/Bucharest')
-    # Get current date in EET and adjust times to EET
-    base_time = datetime.now(eet_timezone).replace(hour=0, minute=0, second=0, microsecond=0)
-
-    points = []
-    for i in range(96):
-        point_time = base_time + timedelta(minutes=15 * i)
-        point_time_utc = point_time.astimezone(pytz.utc)
-        points.append(f"<Point><position>{i+1}</position><quantity>4.3</quantity><time>{to_utc_string(point_time_utc)}</time></Point>")
-    
-    return """
-    <env:Envelope xmlns:env="http://www.w3.org/2003/05/soap-envelope">
-        <env:Header/>
-        <env:Body>
-            <ns2:RunSynchronousResponse xmlns:ns2="http://markets.transelectrica.ro/wse">
-                <ns2:Output>
-                    <ns2:RQID>-1</ns2:RQID>
-                    <ns2:Result>
-                        <GenerationSchedule_MarketDocument xmlns="urn:iec62325.351:tc57wg16:451-7:generationdocument:7:2">
-                            <TimeSeries>
-                                <Period>
-                                    <timeInterval>
-                                        <start>{start}</start>
-                                        <end>{end}</end>
-                                    </timeInterval>
-                                    <Resolution>PT15M</Resolution>
-                                    {points}
-                                </Period>
-                            </TimeSeries>
-                        </GenerationSchedule_MarketDocument>
-                    </ns2:Result>
-                    <ns2:RQState>
-                        <ns2:Code>COMPLETED</ns2:Code>
-                        <ns2:Description>The request is completed.</ns2:Description>
-                    </ns2:RQState>
-                </ns2:Output>
-            </ns2:RunSynchronousResponse>
-        </env:Body>
-    </env:Envelope>
-    """.format(
-        start=to_utc_string(base_time.astimezone(pytz.utc)),
-        end=to_utc_string((base_time + timedelta(hours=24) - timedelta(minutes=15)).astimezone(pytz.utc)),
-        points="".join(points)
-    )
-
-def create_tomorrows_generation_schedule():
-    intervals = []
-    base_time = datetime.strptime("2024-12-08T22:00:00Z", "%Y-%m-%dT%H:%M:%SZ")
-    for i in range(96):
-        start_time = base_time + timedelta(minutes=15 * i)
-        end_time = start_time + timedelta(minutes=15)
-        hour = (start_time.hour + 2) % 24  # Adjust for EET (UTC+2 in winter)
-        if 0 <= hour <=24:
-            power = 4
-        # elif 17 <= hour <= 24:
-        #     power = 4
-        else:
-            power = 0
-        
-        intervals.append({
-            "Ora de Inceput": convert_utc_to_eet(start_time.strftime("%Y-%m-%dT%H:%M:%SZ")),
-            "Ora de Sfarsit": convert_utc_to_eet(end_time.strftime("%Y-%m-%dT%H:%M:%SZ")),
-            "Punct de bază [MW]": power,
-            "Bandă reglare [MW]": 0
-        })
-    return intervals
-
-def create_2days_ahead_generation_schedule():
-    intervals = []
-    base_time = datetime.strptime("2024-12-09T22:00:00Z", "%Y-%m-%dT%H:%M:%SZ")
-    for i in range(96):
-        start_time = base_time + timedelta(minutes=15 * i)
-        end_time = start_time + timedelta(minutes=15)
-        hour = (start_time.hour + 2) % 24  # Adjust for EET (UTC+2 in winter)
-        
-        if 0 <= hour <= 24:
-            power = 4
-        # elif 17 <= hour <= 24:
-        #     power = 4
-        # elif 16 <= hour < 19:
-        #     power = 8.6
-        else:
-            power = 0
-        
-        intervals.append({
-            "Ora de Inceput": convert_utc_to_eet(start_time.strftime("%Y-%m-%dT%H:%M:%SZ")),
-            "Ora de Sfarsit": convert_utc_to_eet(end_time.strftime("%Y-%m-%dT%H:%M:%SZ")),
-            "Punct de bază [MW]": power,
-            "Bandă reglare [MW]": 0
-        })
-    return intervals
-
-def create_standard_generation_schedule(date_from):
-    intervals = []
-    base_time = datetime.combine(date_from, datetime.min.time())
-    for i in range(96):
-        start_time = base_time + timedelta(minutes=15 * i)
-        end_time = start_time + timedelta(minutes=15)
-        power = 4.3  # Standard power output for the entire day
-        
-        intervals.append({
-            "Ora de Inceput": convert_utc_to_eet(start_time.strftime("%Y-%m-%dT%H:%M:%S")),
-            "Ora de Sfarsit": convert_utc_to_eet(end_time.strftime("%Y-%m-%dT%H:%M:%S")),
-            "Punct de bază [MW]": power,
-            "Bandă reglare [MW]": 0
-        })
-    return intervals
-
-# Function to send SOAP request for dispatch orders
-def get_dispatch_orders(date_from, date_to):
-    created, expires = get_current_timestamp()
-    date_to = date_to - timedelta(days=1)
-    # SOAP request XML
-    soap_request = f"""
-    <soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope" xmlns:wse="http://markets.transelectrica.ro/wse">
-        <soap:Header>
-            <wsse:Security soap:mustUnderstand="true" xmlns:wsse="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd" xmlns:wsu="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-utility-1.0.xsd">
-                <wsse:UsernameToken wsu:Id="username_token_id">
-                    <wsse:Username>{ACCESS_CODE_1}</wsse:Username>
-                    <wsse:Password Type="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-username-token-profile-1.0#PasswordText">{ACCESS_CODE_2}</wsse:Password>
-                </wsse:UsernameToken>
-                <wsu:Timestamp wsu:Id="timestamp_id">
-                    <wsu:Created>{created}</wsu:Created>
-                    <wsu:Expires>{expires}</wsu:Expires>
-                </wsu:Timestamp>
-            </wsse:Security>
-        </soap:Header>
-        <soap:Body>
-            <wse:RunSynchronous>
-                <wse:Input>
-                    <wse:FID>DISPATCH_ORDERS_MANUAL_DOWNLOAD_XML_OUT</wse:FID>
-                    <wse:Parameters>
-                        <wse:DateParam Name="DateFrom">{date_from}</wse:DateParam>
-                        <wse:DateParam Name="DateTo">{date_to}</wse:DateParam>
-                    </wse:Parameters>
-                </wse:Input>
-            </wse:RunSynchronous>
-        </soap:Body>
-    </soap:Envelope>
-    """
-
-    headers = {
-        'Content-Type': 'application/soap+xml;charset=UTF-8;action="http://markets.transelectrica.ro/wse/RunSynchronous"',
-    }
-
-    # Send the SOAP request
-    response = requests.post("https://newmarkets.transelectrica.ro/usy-durom-wsendpointg01/00121002300000000000000000000100/ws", data=soap_request, headers=headers)
-
-    if response.status_code == 200:
-        return response.content
-    else:
-        return None
-
-def process_orders_and_calculate_schedule(generation_schedule, orders):
-    live_schedule = []
-    current_power = float(generation_schedule[0]["Punct de bază [MW]"])
-    current_start = generation_schedule[0]["Ora de Inceput"]
-    schedule_changed = False
-
-    for interval in generation_schedule:
-        start_time = interval["Ora de Inceput"]
-        end_time = interval["Ora de Sfarsit"]
-        power = float(interval["Punct de bază [MW]"])
-
-        # Apply orders
-        for order in orders:
-            order_start = order["Ora de Start"]
-            order_end = order["Ora de Sfarsit"]
-            order_power = float(order["Cantitatea"])
-            if order_start <= start_time < order_end:
-                if order["Directia"] == "Crestere":
-                    power += order_power
-                elif order["Directia"] == "Scadere":
-                    power -= order_power
-
-        # If power changes, update live schedule
-        if power != current_power:
-            live_schedule.append({
-                "Ora de Inceput": current_start,
-                "Ora de Sfarsit": start_time,
-                "Punct de bază [MW]": max(0, current_power),
-                "Bandă reglare [MW]": 0
-            })
-            current_start = start_time
-            current_power = power
-            schedule_changed = True
+# Fetching credentials from Streamlit secrets
+ACCESS_CODE_1 = st.secrets["ACCESS_CODE_1"]
+ACCESS_CODE_2 = st.secrets["ACCESS_CODE_2"]
+ACCESS_CODES = (ACCESS_CODE_1, ACCESS_CODE_2)
 
-    # Append the last interval
-    live_schedule.append({
-        "Ora de Inceput": current_start,
-        "Ora de Sfarsit": generation_schedule[-1]["Ora de Sfarsit"],
-        "Punct de bază [MW]": max(0, current_power),
-        "Bandă reglare [MW]": 0
-    })
+# Serve or write the metrics when DAMAS_METRICS_PORT or DAMAS_METRICS_FILE is set, once per process
+start_metrics_export()
 
-    return live_schedule, schedule_changed
+# Function to play the alarm; the page gets a reference to the static file, not its bytes
+def autoplay_audio(alert_id):
+    st.markdown(alarm_html(alert_id), unsafe_allow_html=True)
 
 # Function to handle auto-update and date setting
 def handle_dates():
     if st.session_state.auto_update:
-        eet_timezone = pytz.timezone('Europe/Bucharest')
-        st.session_state.date_from = datetime.now(eet_timezone).date()
-        st.session_state.date_to = (datetime.now(eet_timezone) + timedelta(days=1)).date()
+        st.session_state.date_from, st.session_state.date_to = today_and_tomorrow()
     else:
         if 'date_from' not in st.session_state:
             st.session_state.date_from = None
@@ -393,11 +43,22 @@ def handle_dates():
             st.session_state.date_to = None
     return st.session_state.date_from, st.session_state.date_to
 
-# Function to update the clock
-def update_clock():
-    eet_timezone = pytz.timezone('Europe/Bucharest')
-    current_time = datetime.now(eet_timezone).strftime("%Y-%m-%d %H:%M:%S")
-    clock_placeholder.markdown(f"<h1 style='text-align: right;'>{current_time}</h1>", unsafe_allow_html=True)
+# Function to render the clock; it ticks in the browser, so no server thread has to sleep
+def render_clock():
+    components.html(
+        """
+        <h1 id="clock" style="text-align: right; font-family: sans-serif; margin: 0;"></h1>
+        <script>
+        const clock = document.getElementById("clock");
+        const tick = () => {
+            clock.textContent = new Date().toLocaleString("sv-SE", {timeZone: "Europe/Bucharest"});
+        };
+        tick();
+        setInterval(tick, 1000);
+        </script>
+        """,
+        height=70,
+    )
 
 # Main section
 st.title("Client Web Service Damas")
@@ -411,117 +72,108 @@ auto_update = st.sidebar.checkbox("Auto-Update Dates", value=True)
 st.sidebar.header("Selectați Intervalul de Date")
 date_from_user = st.sidebar.date_input("Data de început", value=datetime.now().date())
 date_to_user = st.sidebar.date_input("Data de sfârșit", value = (datetime.now() + timedelta(days=1)).date())
-dispatch_orders_placeholder = st.empty()
 
-# Use a different audio file URL
-audio_file = "./mixkit-classic-alarm-995.wav"
+# Clock
+render_clock()
 
-# Placeholder for the clock
-clock_placeholder = st.empty()
+# Initialize the orders last shown to this session if not already set
+if 'previous_orders' not in st.session_state:
+    st.session_state.previous_orders = []
 
-# Initialize order count variables if not already set
-if 'previous_order_count' not in st.session_state:
-    st.session_state.previous_order_count = 0
-# st.write(st.session_state)
-def refresh_data(date_from, date_to, previous_order_count):
-    print("The numbers of orders when the function is called: {}".format(previous_order_count))
-    orders = []
+# Function to render dispatch data and sound the alarm when the number of orders changes
+def render_dispatch_data(data, previous_orders):
+    with span("render"):
+        return _render_dispatch_data(data, previous_orders)
 
-    response = get_dispatch_orders(date_from, date_to)
-    
-    # Fetch generation schedule
-    response_schedule = get_generation_schedule(date_from, date_to)
+def _render_dispatch_data(data, previous_orders):
+    # Loaded with the first data to render rather than with the page, it imports numpy
+    from damas.order_delta import diff_orders
 
-    current_date = datetime.now().date()
-    if current_date == datetime(2024, 12, 9).date():
-        generation_schedule = create_tomorrows_generation_schedule()
-    elif current_date == datetime(2024, 12, 8).date():
-        generation_schedule = create_2days_ahead_generation_schedule()
-    else:
-        generation_schedule = []  # Replace with your usual generation schedule fetching logic
+    orders = data["orders"]
+    if not data["orders_available"]:
+        st.error("Nu exista ordine pentru perioada selectata.")
 
-    if response:
-        # Parse the XML response
-        root = ET.fromstring(response)
-        for bid_time_series in root.findall(".//{urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2}Bid_TimeSeries"):
-            direction_code = bid_time_series.find(".//{urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2}flowDirection.direction").text
-            direction = "Crestere" if direction_code == "A01" else "Scadere" if direction_code == "A02" else direction_code
-            # Extract start and end times from the Period
-            period = bid_time_series.find(".//{urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2}Period")
-            start_time = period.find(".//{urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2}start").text
-            end_time = period.find(".//{urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2}end").text
-            orders.append({
-                "Ora de Start": convert_utc_to_eet(start_time),
-                "Ora de Sfarsit": convert_utc_to_eet(end_time),
-                "Directia": direction,
-                "Cantitatea": bid_time_series.find(".//{urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2}quantity.quantity").text,
-            })
-        if orders:
-            # Sort orders by 'Ora de Start'
-            orders = sorted(orders, key=lambda x: x['Ora de Start'])
+    live_schedule = data["live_schedule"]
+    if live_schedule is not None:
+        st.header("Program de Generare Live:", divider="gray")
+        render_schedule(live_schedule, key="live_schedule")
     else:
-        dispatch_orders_placeholder.error("Nu exista ordine pentru perioada selectata.")
-
-    if len(generation_schedule) > 0:
-        generation_schedule = sorted(generation_schedule, key=lambda x: x['Ora de Inceput'])
+        st.warning("Programul de generare nu este disponibil.")
 
-        # Process orders and calculate live schedule
-        live_schedule, schedule_changed = process_orders_and_calculate_schedule(generation_schedule, orders)
-        st.write("Program de Generare Live:")
-        st.table(live_schedule)
-        
-        # Check if the order count has changed
-        if len(orders) != previous_order_count:
-            previous_order_count = len(orders)
-            with open(audio_file, "rb") as f:
-                audio_bytes = f.read()
-            st.audio(audio_bytes, format="audio/wav", autoplay=True)
-       
-    elif response_schedule:
-        generation_schedule = parse_generation_schedule(response_schedule, date_from)
-        
-        if generation_schedule:
-            generation_schedule = sorted(generation_schedule, key=lambda x: x['Ora de Inceput'])
+    # Check if any order was added, removed or replaced since the last render, with or without a schedule
+    delta = diff_orders(previous_orders, orders)
+    if delta:
+        print("The alarm must be triggered!")
+        st.info(f"Ordine noi: {len(delta.added)}, anulate: {len(delta.removed)}, modificate: {len(delta.changed)}")
+        previous_orders = orders
+        autoplay_audio(time.time_ns())
 
-            # Process orders and calculate live schedule
-            live_schedule, schedule_changed = process_orders_and_calculate_schedule(generation_schedule, orders)
-            st.header("Program de Generare Live:", divider="gray")
-            st.table(live_schedule)
-            print(len(orders), previous_order_count)
-            # Check if the order count has changed
-            if len(orders) != previous_order_count:
-                print("The alarm must be triggered!")
-                previous_order_count = len(orders)
-                # st.audio("./mixkit-classic-alarm-995.wav", format="audio/wav", loop=False, autoplay=True)
-                # autoplay_audio(audio_file)
-                with open(audio_file, "rb") as f:
-                    audio_bytes = f.read()
-                st.audio(audio_bytes, format="audio/wav", autoplay=True)
     # Filter orders for the current day
-    current_day_orders = [order for order in orders if datetime.strptime(order["Ora de Start"], '%Y-%m-%d %H:%M:%S').date() == date_from]
+    current_day = data["date_from"].isoformat()
+    current_day_orders = [order for order in orders if order["Ora de Start"][:10] == current_day]
 
     if current_day_orders:
         st.subheader("Ordine de Dispecer:", divider="gray")
-        st.table(current_day_orders)
+        render_records(current_day_orders, key="current_day_orders")
     else:
-        dispatch_orders_placeholder.error("Nu exista ordine pentru ziua curentă.")
-    return previous_order_count
+        st.error("Nu exista ordine pentru ziua curentă.")
+    return previous_orders
+
+def refresh_data(date_from, date_to, previous_orders):
+    with span("refresh"):
+        try:
+            data = load_dispatch_data(date_from, date_to, ACCESS_CODES)
+        except TimeoutError:
+            # Keep the orders last shown, so the next successful refresh still raises the alarm
+            st.error("Serviciul Damas nu a răspuns la timp. Încercați din nou.")
+            return previous_orders
+        return render_dispatch_data(data, previous_orders)
+
+# Function to render the stage timings of this server process in the sidebar
+def render_metrics_panel():
+    with st.sidebar.expander("Metrici de performanță"):
+        records = summary_records()
+        if not records:
+            st.caption("Nicio măsurătoare încă.")
+            return
+        st.dataframe(records, hide_index=True)
+        spans = [
+            {"Ora": time.strftime("%H:%M:%S", time.localtime(at)), "Etapa": stage, "Durata [ms]": round(seconds * 1000, 1)}
+            for at, stage, seconds in reversed(REGISTRY.recent_spans())
+        ]
+        st.dataframe(spans, hide_index=True)
+
+# One poller per server process follows today and tomorrow; sessions only read its snapshots
+@st.cache_resource
+def get_dispatch_poller():
+    if MONITOR_SOCKET:
+        from damas.monitor_events import MonitorSubscriber
+        return MonitorSubscriber(MONITOR_SOCKET).start()
+    return start_dispatch_poller(ACCESS_CODES)
+
+# Re-reads the latest snapshot on a timer, without blocking the session in between
+@fragment(run_every=SNAPSHOT_CHECK_INTERVAL)
+def live_dispatch_view():
+    handle_dates()
+    snapshot = get_dispatch_poller().snapshot()
+    if snapshot is None:
+        st.info("Se încarcă ordinele de dispecer...")
+        return
+    if snapshot.error:
+        st.warning(f"Ultima actualizare a eșuat: {snapshot.error}")
+    if snapshot.data is not None:
+        st.session_state.previous_orders = render_dispatch_data(snapshot.data, st.session_state.previous_orders)
 
 manual_selection = False
 if st.sidebar.button("Obține Ordine de Dispecer"):
-    refresh_data(date_from_user, date_to_user, st.session_state.previous_order_count)
+    st.session_state.previous_orders = refresh_data(date_from_user, date_to_user, st.session_state.previous_orders)
     manual_selection = True
 if auto_update:
     st.session_state.auto_update = True
 else:
     st.session_state.auto_update = False
 
-while True:
-    if auto_update and not manual_selection:
-        date_from, date_to = handle_dates()
-        st.session_state.previous_order_count = refresh_data(date_from, date_to, st.session_state.previous_order_count)
-        # st.write(st.session_state)
-    for _ in range(60*10):
-        update_clock()
-        time.sleep(1)
-    st.rerun()
+if auto_update and not manual_selection:
+    live_dispatch_view()
+
+render_metrics_panel()
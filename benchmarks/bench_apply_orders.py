@@ -0,0 +1,103 @@
+"""
+Month replay timing for apply_orders_to_schedule.
+
+Replays a synthetic month of dispatch orders onto a 2,976-slot July schedule with the
+original per-interval strptime loop and with the batched implementation, checks that
+both produce the same live schedule and prints the time of each.
+
+The batched implementation clamps at zero once, after every order has been applied. The
+original loop clamped after each order, so a Scadere below zero followed by a Crestere on
+the same slot ended higher there. Parity is checked against the loop with the single final
+clamp, and the number of slots where the per-order clamp gives another result is printed.
+
+Run with:
+    python benchmarks/bench_apply_orders.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from damas.dispatch_orders import DispatchOrder
+from damas.quarter_hour_schedule import QuarterHourSchedule
+from damas.schedule_engine import apply_orders_to_schedule
+from damas.timezones import convert_utc_to_eet
+
+
+# The original implementation from monthly_generation_schedule.py, kept as the reference
+def reference_apply_orders_to_schedule(initial_schedule, orders, clamp_each_order=True):
+    live_schedule = [interval.copy() for interval in initial_schedule]
+
+    for order in orders:
+        order_start = datetime.strptime(order["Ora de Start"], "%Y-%m-%d %H:%M:%S")
+        order_end = datetime.strptime(order["Ora de Sfarsit"], "%Y-%m-%d %H:%M:%S")
+        order_power = float(order["Cantitatea"])
+        direction = order["Directia"]
+
+        for interval in live_schedule:
+            interval_start = datetime.strptime(interval["Ora de Inceput"], "%Y-%m-%d %H:%M:%S")
+            interval_end = datetime.strptime(interval["Ora de Sfarsit"], "%Y-%m-%d %H:%M:%S")
+
+            if order_start <= interval_start < order_end:
+                if direction == "Crestere":
+                    interval["Punct de bază [MW]"] += order_power
+                elif direction == "Scadere":
+                    interval["Punct de bază [MW]"] -= order_power
+                if clamp_each_order:
+                    interval["Punct de bază [MW]"] = max(0, interval["Punct de bază [MW]"])  # Ensure no negative values
+
+    if not clamp_each_order:
+        for interval in live_schedule:
+            interval["Punct de bază [MW]"] = max(0, interval["Punct de bază [MW]"])
+    return live_schedule
+
+
+def make_month_orders(count, rng):
+    # Local midnight of 2024-07-01, in UTC
+    base_time = datetime(2024, 6, 30, 21)
+    orders = []
+    for _ in range(count):
+        start_time = base_time + timedelta(minutes=15 * rng.randrange(0, 31 * 96))
+        end_time = start_time + timedelta(minutes=15 * rng.randrange(1, 16))
+        direction = rng.choice(["Crestere", "Scadere"])
+        quantity = float(rng.choice(["0.5", "1.2", "2", "4.3", "8.6"]))
+        orders.append(DispatchOrder(f"{start_time:%Y-%m-%dT%H:%MZ}", f"{end_time:%Y-%m-%dT%H:%MZ}", direction, quantity).as_record(convert_utc_to_eet))
+    return orders
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    rng = random.Random(2024)
+    schedule = QuarterHourSchedule.for_local_days(date(2024, 7, 1), date(2024, 7, 31), 4.3)
+    records = schedule.to_records()
+
+    for count in (31, 124):
+        orders = make_month_orders(count, rng)
+        original, reference = timed(reference_apply_orders_to_schedule, records, orders)
+        expected = reference_apply_orders_to_schedule(records, orders, clamp_each_order=False)
+        live_schedule, batched_schedule = timed(apply_orders_to_schedule, schedule, orders)
+        assert np.allclose(live_schedule.base_point, [r["Punct de bază [MW]"] for r in expected])
+        clamped = int(np.sum(~np.isclose(live_schedule.base_point, [r["Punct de bază [MW]"] for r in original])))
+        print(
+            f"{count:>5} orders: reference {reference * 1000:9.1f} ms, batched schedule {batched_schedule * 1000:6.2f} ms, "
+            f"{clamped} slots differ from the per-order clamp"
+        )
+
+    for count in (1000, 10000):
+        orders = make_month_orders(count, rng)
+        _, batched_schedule = timed(apply_orders_to_schedule, schedule, orders)
+        print(f"{count:>5} orders: batched schedule {batched_schedule * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Dispatch order parsing: ElementTree loop vs the streaming iterparse parser.
+
+Builds a synthetic 10k-order response, checks that both parsers return the same
+orders and prints the time of each.
+
+Run with:
+    python benchmarks/bench_dispatch_parse.py
+"""
+import os
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from damas.dispatch_orders import parse_dispatch_orders
+from synthetic_documents import dispatch_orders_document
+
+
+# The parse loop refresh_data and fetch_july_orders used, kept as the reference
+def reference_parse(response, convert_time):
+    orders = []
+    root = ET.fromstring(response)
+    for bid_time_series in root.findall(".//{urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2}Bid_TimeSeries"):
+        direction_code = bid_time_series.find(".//{urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2}flowDirection.direction").text
+        direction = "Crestere" if direction_code == "A01" else "Scadere" if direction_code == "A02" else direction_code
+        period = bid_time_series.find(".//{urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2}Period")
+        start_time = period.find(".//{urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2}start").text
+        end_time = period.find(".//{urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2}end").text
+        orders.append({
+            "Ora de Start": convert_time(start_time),
+            "Ora de Sfarsit": convert_time(end_time),
+            "Directia": direction,
+            "Cantitatea": bid_time_series.find(".//{urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2}quantity.quantity").text,
+        })
+    return orders
+
+
+def identity(timestamp):
+    return timestamp
+
+
+def main():
+    for order_count in (100, 10000):
+        response = dispatch_orders_document(order_count, days=7)
+        expected = reference_parse(response, identity)
+        actual = parse_dispatch_orders(response, identity)
+        assert [{key: order[key] for key in expected[0]} for order in actual] == [{**order, "Cantitatea": float(order["Cantitatea"])} for order in expected]
+
+        number = 20 if order_count < 1000 else 3
+        reference = timeit.timeit(lambda: reference_parse(response, identity), number=number) / number
+        streaming = timeit.timeit(lambda: parse_dispatch_orders(response, identity), number=number) / number
+        print(f"{order_count:>6} orders ({len(response) / 1e6:.1f} MB): ElementTree {reference * 1000:8.1f} ms, iterparse {streaming * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
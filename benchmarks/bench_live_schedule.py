@@ -0,0 +1,118 @@
+"""
+Timing for the live schedule of the dashboard.
+
+Times QuarterHourSchedule.apply_orders and to_block_records against the original
+per-interval loop on random multi-day schedules and order sets. The reference and the
+generators are shared with tests/test_live_schedule.py, which checks their parity.
+
+Run with:
+    python benchmarks/bench_live_schedule.py
+"""
+import os
+import random
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from damas.dispatch_orders import DispatchOrder
+from damas.quarter_hour_schedule import QuarterHourSchedule
+from damas.timezones import convert_utc_to_eet
+
+# Base points and order quantities of the random schedules, as in real reports
+BASE_POINTS = (4.3, 4.3, 8.6, 0)
+QUANTITIES = ("0.1", "0.7", "1.2", "2", "4.3", "8.6")
+
+
+# The original O(intervals x orders) implementation from app.py, kept as the parity reference
+def reference_process_orders_and_calculate_schedule(generation_schedule, orders):
+    live_schedule = []
+    current_power = float(generation_schedule[0]["Punct de bază [MW]"])
+    current_start = generation_schedule[0]["Ora de Inceput"]
+    schedule_changed = False
+
+    for interval in generation_schedule:
+        start_time = interval["Ora de Inceput"]
+        end_time = interval["Ora de Sfarsit"]
+        power = float(interval["Punct de bază [MW]"])
+
+        # Apply orders
+        for order in orders:
+            order_start = order["Ora de Start"]
+            order_end = order["Ora de Sfarsit"]
+            order_power = float(order["Cantitatea"])
+            if order_start <= start_time < order_end:
+                if order["Directia"] == "Crestere":
+                    power += order_power
+                elif order["Directia"] == "Scadere":
+                    power -= order_power
+
+        # If power changes, update live schedule
+        if power != current_power:
+            live_schedule.append({
+                "Ora de Inceput": current_start,
+                "Ora de Sfarsit": start_time,
+                "Punct de bază [MW]": max(0, current_power),
+                "Bandă reglare [MW]": 0
+            })
+            current_start = start_time
+            current_power = power
+            schedule_changed = True
+
+    # Append the last interval
+    live_schedule.append({
+        "Ora de Inceput": current_start,
+        "Ora de Sfarsit": generation_schedule[-1]["Ora de Sfarsit"],
+        "Punct de bază [MW]": max(0, current_power),
+        "Bandă reglare [MW]": 0
+    })
+
+    return live_schedule, schedule_changed
+
+
+def make_schedule(days, rng, base_points=BASE_POINTS):
+    first_day = date(2024, 12, 8)
+    schedule = QuarterHourSchedule.for_local_days(first_day, first_day + timedelta(days=days - 1), 0)
+    schedule.base_point[:] = [rng.choice(base_points) for _ in range(len(schedule))]
+    return schedule
+
+
+# Function to build an order record the way the parser does, from its UTC times
+def make_order(start_time, end_time, direction, quantity):
+    return DispatchOrder(f"{start_time:%Y-%m-%dT%H:%M:%SZ}", f"{end_time:%Y-%m-%dT%H:%M:%SZ}", direction, float(quantity)).as_record(convert_utc_to_eet)
+
+
+def make_orders(days, count, rng, quantities=QUANTITIES):
+    # Local midnight of 2024-12-08, in UTC
+    base_time = datetime(2024, 12, 7, 22)
+    orders = []
+    for _ in range(count):
+        # Mostly quarter-hour aligned, sometimes on odd minutes like real manual orders
+        minutes = rng.randrange(0, 96 * days * 15, rng.choice([15, 15, 15, 1]))
+        start_time = base_time + timedelta(minutes=minutes - 60)
+        end_time = start_time + timedelta(minutes=rng.randrange(1, 240))
+        direction = rng.choice(["Crestere", "Scadere", "Scadere", "A03"])
+        orders.append(make_order(start_time, end_time, direction, rng.choice(quantities)))
+    return orders
+
+
+# Function to compute the live schedule blocks the way the dashboard does
+def live_blocks(schedule, orders):
+    return schedule.apply_orders(orders).to_block_records()
+
+
+def main():
+    rng = random.Random(7)
+    for days, count in [(1, 20), (7, 300), (31, 1000)]:
+        schedule = make_schedule(days, rng)
+        records = schedule.to_records()
+        orders = make_orders(days, count, rng)
+        number = 3 if days > 7 else 10
+        reference = timeit.timeit(lambda: reference_process_orders_and_calculate_schedule(records, orders), number=number) / number
+        engine = timeit.timeit(lambda: live_blocks(schedule, orders), number=number) / number
+        print(f"{days:>2} days, {count:>4} orders: reference {reference * 1000:9.2f} ms, engine {engine * 1000:7.2f} ms ({reference / engine:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
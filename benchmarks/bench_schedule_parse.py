@@ -0,0 +1,94 @@
+"""
+Generation schedule parsing throughput, in intervals per second.
+
+Compares the original ElementTree parser, which printed every interval, with the
+compiled XPath parser on synthetic 1-day, 1-week and 1-month responses. The original
+parser's output goes to /dev/null so only the serialization cost is measured, not
+the terminal.
+
+Run with:
+    python benchmarks/bench_schedule_parse.py
+"""
+import contextlib
+import os
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from damas.schedule_parser import parse_generation_schedule
+from synthetic_documents import generation_schedule_document
+
+
+# The original parser from app.py, kept as the reference
+def reference_parse_generation_schedule(response_schedule, date_from):
+    try:
+        root_schedule = ET.fromstring(response_schedule)
+    except ET.ParseError as e:
+        print("XML Parse Error:", e)
+        return []
+
+    namespaces = {
+        "soap": "http://www.w3.org/2003/05/soap-envelope",
+        "ns1": "http://markets.transelectrica.ro/wse"
+    }
+    print("Root Element:", root_schedule.tag)
+    intervals = root_schedule.findall(".//ns1:Interval", namespaces=namespaces)
+    print("Matched Intervals Count:", len(intervals))
+    if not intervals:
+        print("No intervals found in the XML. Check namespaces or structure.")
+        return []
+
+    generation_schedule = []
+    for interval in intervals:
+        print("Interval Element:", ET.tostring(interval, encoding="unicode"))
+        pos_elem = interval.find("ns1:Pos", namespaces=namespaces)
+        qty_elem = interval.find("ns1:Qty", namespaces=namespaces)
+        if pos_elem is None or qty_elem is None:
+            print("Missing 'Pos' or 'Qty' in Interval. Skipping.")
+            continue
+        position = int(pos_elem.get("v"))
+        quantity = float(qty_elem.get("v"))
+        initial_start_time = datetime.combine(date_from, datetime.min.time())
+        start_time = initial_start_time + timedelta(minutes=15 * (position - 1))
+        end_time = start_time + timedelta(minutes=15)
+        generation_schedule.append({
+            "Ora de Inceput": start_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "Ora de Sfarsit": end_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "Punct de bază [MW]": quantity,
+            "Bandă reglare [MW]": 0
+        })
+    return generation_schedule
+
+
+def main():
+    date_from = date(2024, 12, 9)
+    with open(os.devnull, "w") as devnull:
+        for label, days in (("1 day", 1), ("1 week", 7), ("1 month", 31)):
+            response = generation_schedule_document(days)
+            with contextlib.redirect_stdout(devnull):
+                expected = reference_parse_generation_schedule(response, date_from)
+            assert parse_generation_schedule(response, date_from).base_point.tolist() == [r["Punct de bază [MW]"] for r in expected]
+
+            number = 20
+            with contextlib.redirect_stdout(devnull):
+                reference = timeit.timeit(lambda: reference_parse_generation_schedule(response, date_from), number=number) / number
+            compiled = timeit.timeit(lambda: parse_generation_schedule(response, date_from), number=number) / number
+            intervals = 96 * days
+            print(f"{label:>7}: reference {intervals / reference:12,.0f} intervals/s, compiled XPath {intervals / compiled:12,.0f} intervals/s")
+
+    # One Period per day, placed by its TimeInterval, matches the continuous single-Period response
+    first_day = datetime(2024, 12, 9)
+    for label, days in (("1 week", 7), ("1 month", 31)):
+        continuous = parse_generation_schedule(generation_schedule_document(days), first_day.date())
+        response = generation_schedule_document(days, first_day=first_day)
+        assert parse_generation_schedule(response, first_day.date()) == continuous
+        number = 20
+        per_day = timeit.timeit(lambda: parse_generation_schedule(response, first_day.date()), number=number) / number
+        print(f"{label:>7}: one Period per day {96 * days / per_day:12,.0f} intervals/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Cold start and per-rerun cost of the dashboard.
+
+Every measurement runs in a fresh interpreter, against a stand-in DAMAS endpoint
+(stub_server.py) so no request leaves the machine:
+
+    server ready      `streamlit run app.py` until /_stcore/health answers
+    import monitor    importing the headless entry point, i.e. the whole fetch/parse stack
+    first run         the first execution of app.py in a session, imports included
+    rerun             the following executions, as on every widget change
+
+Prints the median of --repeats runs of each.
+
+Run with:
+    python benchmarks/bench_startup.py
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+STUB_PATH = os.path.join(ROOT, "benchmarks", "stub_server.py")
+
+APP_RUNS = '''
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.secrets["ACCESS_CODE_1"] = at.secrets["ACCESS_CODE_2"] = "stub"
+started = time.perf_counter()
+at.run()
+first = time.perf_counter() - started
+reruns = []
+for _ in range(int(sys.argv[2])):
+    started = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - started)
+print(json.dumps({"first": first, "rerun": sorted(reruns)[len(reruns) // 2], "exceptions": len(at.exception)}))
+'''
+
+IMPORT_MONITOR = '''
+import sys, time
+started = time.perf_counter()
+import monitor
+print(time.perf_counter() - started)
+'''
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(url, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            time.sleep(0.02)
+    return False
+
+
+def server_ready_seconds(env):
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true", "--server.port", str(port)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not wait_until_ready(f"http://127.0.0.1:{port}/_stcore/health"):
+            raise RuntimeError("streamlit did not start")
+        return time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run_python(code, env, *args):
+    output = subprocess.run([sys.executable, "-c", code, *args], cwd=ROOT, env=env, check=True, capture_output=True, text=True).stdout
+    return output.strip().splitlines()[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the dashboard's cold start and rerun cost.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--reruns", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    stub_port = free_port()
+    stub = subprocess.Popen([sys.executable, STUB_PATH, "--port", str(stub_port)], stdout=subprocess.DEVNULL)
+    archive = tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False).name
+    env = dict(os.environ, DAMAS_ENDPOINT=f"http://127.0.0.1:{stub_port}/ws", DAMAS_ARCHIVE_PATH=archive, PYTHONPATH=ROOT)
+    try:
+        results = {"server ready": [], "import monitor": [], "first run": [], "rerun": []}
+        for _ in range(args.repeats):
+            results["server ready"].append(server_ready_seconds(env))
+            results["import monitor"].append(float(run_python(IMPORT_MONITOR, env)))
+            runs = json.loads(run_python(APP_RUNS, env, APP_PATH, str(args.reruns)))
+            if runs["exceptions"]:
+                raise RuntimeError("app.py raised an exception")
+            results["first run"].append(runs["first"])
+            results["rerun"].append(runs["rerun"])
+    finally:
+        stub.terminate()
+        stub.wait()
+        os.unlink(archive)
+
+    for label, values in results.items():
+        print(f"{label:>15}: {statistics.median(values) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Load generator for the fetch, parse and apply pipeline.
+
+Every session repeats what one dashboard refresh does: download the dispatch orders and the
+generation schedule concurrently, parse both and apply the orders to the schedule. The
+report cache and the archive are bypassed, so each iteration makes real HTTP round trips.
+Prints the p50/p99 latency of each stage and of the whole refresh.
+
+Against a stand-in started in-process:
+    python benchmarks/load_test.py --sessions 16 --duration 30 --latency 0.2 --error-rate 0.02
+
+Against a stand-in, or any endpoint, that is already running:
+    python benchmarks/load_test.py --endpoint http://127.0.0.1:8089/ws --sessions 16
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from damas.client import DamasClient
+from damas.dispatch_orders import parse_dispatch_orders
+from damas.schedule_parser import parse_generation_schedule
+from damas.soap_envelope import DISPATCH_ORDERS_FID, GENERATION_SCHEDULES_FID, build_run_synchronous
+from damas.timezones import convert_utc_to_eet
+from stub_server import StubSettings, endpoint_url, start_stub_server
+
+STAGES = ("fetch", "parse", "apply", "total")
+
+
+# Function to run one refresh and time its stages
+def run_refresh(client, fetch_pool, date_from, date_to, access_codes):
+    """
+    Returns:
+        dict | None: The seconds spent in each stage, or None if a report failed.
+    """
+    def fetch(fid, report_to):
+        soap_request = build_run_synchronous(fid, {"DateFrom": date_from, "DateTo": report_to}, *access_codes)
+        return client.post(soap_request, "RunSynchronous")
+
+    started = time.perf_counter()
+    # The dispatch orders are requested up to the day before date_to, like get_dispatch_orders
+    orders_future = fetch_pool.submit(fetch, DISPATCH_ORDERS_FID, date_to - timedelta(days=1))
+    response_schedule = fetch(GENERATION_SCHEDULES_FID, date_to)
+    response_orders = orders_future.result()
+    fetched = time.perf_counter()
+    if not response_orders or not response_schedule:
+        return None
+
+    generation_schedule = parse_generation_schedule(response_schedule, date_from)
+    orders = sorted(parse_dispatch_orders(response_orders, convert_utc_to_eet), key=lambda x: x['Ora de Start'])
+    parsed = time.perf_counter()
+
+    generation_schedule.apply_orders(orders)
+    applied = time.perf_counter()
+    return {"fetch": fetched - started, "parse": parsed - fetched, "apply": applied - parsed, "total": applied - started}
+
+
+# Function to drive `sessions` concurrent refresh loops for `duration` seconds
+def run_load(endpoint, sessions, duration, date_from, days, access_codes=("stub", "stub")):
+    """
+    Returns:
+        tuple[dict, int, float]: The timings of every successful refresh by stage, the number
+        of failed refreshes and the wall-clock seconds of the run.
+    """
+    date_to = date_from + timedelta(days=days)
+    # Enough pooled connections for every session and its concurrent second report
+    client = DamasClient(endpoint, pool_maxsize=2 * sessions)
+    timings = {stage: [] for stage in STAGES}
+    failures = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def session(fetch_pool):
+        while time.perf_counter() < deadline:
+            result = run_refresh(client, fetch_pool, date_from, date_to, access_codes)
+            with lock:
+                if result is None:
+                    failures[0] += 1
+                    continue
+                for stage in STAGES:
+                    timings[stage].append(result[stage])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(sessions, thread_name_prefix="fetch") as fetch_pool, \
+            ThreadPoolExecutor(sessions, thread_name_prefix="session") as session_pool:
+        for future in [session_pool.submit(session, fetch_pool) for _ in range(sessions)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+    client.close()
+    return timings, failures[0], elapsed
+
+
+def print_report(timings, failures, elapsed, sessions):
+    completed = len(timings["total"])
+    print(f"{sessions} sessions, {completed} refreshes in {elapsed:.1f} s "
+          f"({completed / elapsed:.1f}/s), {failures} failed")
+    if not completed:
+        return
+    print(f"{'stage':<8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for stage in STAGES:
+        values = np.array(timings[stage]) * 1000
+        p50, p99 = np.percentile(values, [50, 99])
+        print(f"{stage:<8}{p50:>10.1f}{p99:>10.1f}{values.max():>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive the DAMAS fetch, parse and apply pipeline under load.")
+    parser.add_argument("--endpoint", help="A running endpoint; without it a stand-in is started in-process.")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions.")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to run.")
+    parser.add_argument("--date-from", type=date.fromisoformat, default=date(2024, 12, 8))
+    parser.add_argument("--days", type=int, default=2, help="Days per refresh, 2 like the dashboard.")
+    parser.add_argument("--orders-per-day", type=int, default=40, help="In-process stand-in only.")
+    parser.add_argument("--latency", type=float, default=0.0, help="In-process stand-in only.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="In-process stand-in only.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="In-process stand-in only.")
+    args = parser.parse_args(argv)
+
+    server = None
+    endpoint = args.endpoint
+    if endpoint is None:
+        settings = StubSettings(args.orders_per_day, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+        server = start_stub_server(settings, port=0)
+        endpoint = endpoint_url(server)
+    try:
+        timings, failures, elapsed = run_load(endpoint, args.sessions, args.duration, args.date_from, args.days)
+    finally:
+        if server is not None:
+            server.shutdown()
+    print_report(timings, failures, elapsed, args.sessions)
+
+
+if __name__ == "__main__":
+    main()
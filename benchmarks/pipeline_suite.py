@@ -0,0 +1,193 @@
+"""
+Pipeline benchmark suite with a stored baseline.
+
+Times every hot path of a refresh separately on fixed synthetic fixtures of 1 day, 1 week
+and 1 month (October 2024, so the month includes the 100-quarter DST day):
+
+    fetch      both reports from an in-process stand-in, see stub_server.py
+    parse      parse_generation_schedule and the dispatch order parse
+    convert    convert_utc_to_eet over every order timestamp
+    apply      apply_orders_to_schedule
+    render     the block summary and the first table page of the live schedule
+
+Each benchmark reports the best per-call time of several repeats. The results are compared
+with benchmarks/baseline.json and the run fails when a benchmark is slower than its baseline
+by more than --tolerance. Timings depend on the machine, so record a baseline on the machine
+that runs the comparison:
+
+    python benchmarks/pipeline_suite.py --save     # record benchmarks/baseline.json
+    python benchmarks/pipeline_suite.py            # compare, exit status 1 on a regression
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from damas.client import DamasClient
+from damas.dispatch_orders import iter_dispatch_orders, parse_dispatch_orders
+from damas.schedule_engine import apply_orders_to_schedule
+from damas.schedule_parser import parse_generation_schedule
+from damas.soap_envelope import DISPATCH_ORDERS_FID, GENERATION_SCHEDULES_FID, build_run_synchronous
+from damas.timezones import EPOCH, convert_utc_to_eet, local_midnight_epoch
+from stub_server import StubSettings, endpoint_url, start_stub_server
+from synthetic_documents import dispatch_orders_document, generation_schedule_document
+from table_view import PAGE_SIZE
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+FIRST_DAY = date(2024, 10, 1)
+FIXTURE_DAYS = {"1d": 1, "1w": 7, "1m": 31}
+ORDERS_PER_DAY = 40
+FIXTURE_SEED = 20241001
+
+# Slower than the baseline by more than this share counts as a regression
+DEFAULT_TOLERANCE = 0.3
+REPEATS = 5
+
+
+class Fixture:
+    """
+    The documents and the parsed inputs of one fixture size.
+    """
+
+    def __init__(self, name, days):
+        self.name = name
+        self.days = days
+        self.date_from = FIRST_DAY
+        self.date_to = FIRST_DAY + timedelta(days=days - 1)
+        first_day = EPOCH + timedelta(seconds=local_midnight_epoch(FIRST_DAY))
+        self.schedule_document = generation_schedule_document(days, seed=FIXTURE_SEED, first_day=first_day)
+        self.orders_document = dispatch_orders_document(ORDERS_PER_DAY * days, first_day, days, seed=FIXTURE_SEED)
+        self.schedule = parse_generation_schedule(self.schedule_document, self.date_from)
+        self.orders = sorted(parse_dispatch_orders(self.orders_document, convert_utc_to_eet), key=lambda x: x['Ora de Start'])
+        self.timestamps = [timestamp for order in iter_dispatch_orders(self.orders_document) for timestamp in (order.start, order.end)]
+        self.live_schedule = apply_orders_to_schedule(self.schedule, self.orders)
+
+    def digest(self):
+        # Recorded with the baseline, so a change to the synthetic documents is not read as a speed-up
+        return hashlib.sha256(self.schedule_document + self.orders_document).hexdigest()[:16]
+
+
+# Function to list the benchmarks of a fixture as (name, callable) pairs
+def fixture_benchmarks(fixture, client=None):
+    benchmarks = []
+    if client is not None:
+        def fetch():
+            for fid in (GENERATION_SCHEDULES_FID, DISPATCH_ORDERS_FID):
+                soap_request = build_run_synchronous(fid, {"DateFrom": fixture.date_from, "DateTo": fixture.date_to}, "stub", "stub")
+                client.post(soap_request, "RunSynchronous")
+        benchmarks.append(("fetch.reports", fetch))
+
+    def render():
+        fixture.live_schedule.to_block_records()
+        fixture.live_schedule.to_records(0, PAGE_SIZE)
+
+    benchmarks += [
+        ("parse.generation_schedule", lambda: parse_generation_schedule(fixture.schedule_document, fixture.date_from)),
+        ("parse.dispatch_orders", lambda: parse_dispatch_orders(fixture.orders_document, convert_utc_to_eet)),
+        ("convert.utc_to_eet", lambda: [convert_utc_to_eet(timestamp) for timestamp in fixture.timestamps]),
+        ("apply.apply_orders_to_schedule", lambda: apply_orders_to_schedule(fixture.schedule, fixture.orders)),
+        ("render.live_schedule", render),
+    ]
+    return benchmarks
+
+
+# Function to time one callable, the best per-call seconds of REPEATS rounds
+def best_time(function, repeats=REPEATS):
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeats, number=number)) / number
+
+
+# Function to run every benchmark of every fixture
+def run_suite(sizes, fetch=True):
+    """
+    Returns:
+        dict: {"fixtures": {size: digest}, "results": {"<benchmark>[<size>]": seconds}}.
+    """
+    server = client = None
+    if fetch:
+        server = start_stub_server(StubSettings(ORDERS_PER_DAY, seed=FIXTURE_SEED), port=0)
+        client = DamasClient(endpoint_url(server))
+    fixtures = {}
+    results = {}
+    try:
+        for size in sizes:
+            fixture = Fixture(size, FIXTURE_DAYS[size])
+            fixtures[size] = fixture.digest()
+            for name, function in fixture_benchmarks(fixture, client):
+                key = f"{name}[{size}]"
+                results[key] = best_time(function)
+                print(f"{key:<52}{results[key] * 1000:>12.3f} ms")
+    finally:
+        if client is not None:
+            client.close()
+        if server is not None:
+            server.shutdown()
+    return {"fixtures": fixtures, "results": results}
+
+
+# Function to compare a run with the baseline
+def compare(run, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Returns:
+        list[str]: The regressions; benchmarks missing from the baseline or run on a
+        different fixture are reported but never fail the comparison.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<52}{'baseline ms':>12}{'now ms':>12}{'ratio':>8}")
+    for key, seconds in run["results"].items():
+        size = key[key.rindex("[") + 1:-1]
+        reference = baseline["results"].get(key)
+        if reference is None or baseline["fixtures"].get(size) != run["fixtures"][size]:
+            print(f"{key:<52}{'-':>12}{seconds * 1000:>12.3f}{'new':>8}")
+            continue
+        ratio = seconds / reference
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(f"{key}: {reference * 1000:.3f} ms -> {seconds * 1000:.3f} ms ({ratio:.2f}x)")
+        print(f"{key:<52}{reference * 1000:>12.3f}{seconds * 1000:>12.3f}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the fetch, parse, apply and render stages against a baseline.")
+    parser.add_argument("--save", action="store_true", help="Record the results as the new baseline.")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown, 0.3 for 30%%.")
+    parser.add_argument("--size", action="append", choices=tuple(FIXTURE_DAYS), help="Only these fixture sizes.")
+    parser.add_argument("--no-fetch", action="store_true", help="Skip the HTTP round trips to the stand-in.")
+    args = parser.parse_args(argv)
+
+    run = run_suite(args.size or tuple(FIXTURE_DAYS), fetch=not args.no_fetch)
+    if args.save:
+        run["recorded_at"] = datetime.now().astimezone().isoformat(timespec="seconds")
+        run["machine"] = f"{platform.python_implementation()} {platform.python_version()}, {platform.machine()}"
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}, record one with --save")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(run, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
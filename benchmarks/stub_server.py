@@ -0,0 +1,237 @@
+"""
+Offline stand-in for the DAMAS SOAP endpoint.
+
+Answers RunSynchronous for the dispatch order and generation schedule reports with
+synthetic documents, and GetActualDateTime with the current UTC time, so the dashboard,
+the monitor and the load generator can run without the Transelectrica endpoint:
+
+    python benchmarks/stub_server.py --port 8089 --orders-per-day 40 --latency 0.3 --error-rate 0.05
+    DAMAS_ENDPOINT=http://127.0.0.1:8089/ws DAMAS_ARCHIVE_PATH=/tmp/stub_archive.sqlite3 streamlit run app.py
+
+Documents are deterministic for a report and date range; with --churn the dispatch orders
+are regenerated every that many seconds, so pollers see orders being added and cancelled.
+Any access codes are accepted.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lxml import etree
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from damas.soap_envelope import DISPATCH_ORDERS_FID, GENERATION_SCHEDULES_FID
+from damas.timezones import EPOCH, local_midnight_epoch
+from synthetic_documents import dispatch_orders_document, generation_schedule_document
+
+DEFAULT_PORT = 8089
+WSE_NS = "http://markets.transelectrica.ro/wse"
+NAMESPACES = {"wse": WSE_NS}
+
+RUN_SYNCHRONOUS_FID = etree.XPath("string(//wse:RunSynchronous/wse:Input/wse:FID)", namespaces=NAMESPACES)
+RUN_SYNCHRONOUS_DATE_PARAMS = etree.XPath("//wse:RunSynchronous/wse:Input/wse:Parameters/wse:DateParam", namespaces=NAMESPACES)
+
+ENVELOPE_HEAD = '<env:Envelope xmlns:env="http://www.w3.org/2003/05/soap-envelope"><env:Header/><env:Body>'
+ENVELOPE_TAIL = '</env:Body></env:Envelope>'
+FAULT_BODY = (
+    '<env:Fault><env:Code><env:Value>env:Receiver</env:Value></env:Code>'
+    '<env:Reason><env:Text xml:lang="en">{reason}</env:Text></env:Reason></env:Fault>'
+)
+
+
+# Function to build the response of a report, shared by every request for the same range
+@lru_cache(maxsize=256)
+def report_document(fid, date_from, date_to, orders_per_day, resolution, seed):
+    """
+    Build the RunSynchronous response of a report for the local days [date_from, date_to].
+
+    Returns:
+        bytes | None: The response, or None for an unknown FID.
+    """
+    days = max((date_to - date_from).days + 1, 1)
+    first_day = EPOCH + timedelta(seconds=local_midnight_epoch(date_from))
+    if fid == DISPATCH_ORDERS_FID:
+        return dispatch_orders_document(orders_per_day * days, first_day, days, seed=seed)
+    if fid == GENERATION_SCHEDULES_FID:
+        return generation_schedule_document(days, seed=seed, first_day=first_day, resolution=resolution)
+    return None
+
+
+def actual_date_time_document(now=None):
+    now = now or datetime.now(timezone.utc)
+    return (
+        f'{ENVELOPE_HEAD}<ns2:GetActualDateTimeResponse xmlns:ns2="{WSE_NS}"><ns2:Output>'
+        f'<ns2:DateTime>{now:%Y-%m-%dT%H:%M:%S.%f}Z</ns2:DateTime>'
+        f'</ns2:Output></ns2:GetActualDateTimeResponse>{ENVELOPE_TAIL}'
+    ).encode("utf-8")
+
+
+def fault_document(reason):
+    return f"{ENVELOPE_HEAD}{FAULT_BODY.format(reason=reason)}{ENVELOPE_TAIL}".encode("utf-8")
+
+
+class StubSettings:
+    """
+    How the stand-in behaves: document size, simulated latency and error rate.
+    """
+
+    def __init__(self, orders_per_day=40, resolution="PT15M", latency=0.0, jitter=0.0, error_rate=0.0,
+                 churn=0, seed=0):
+        self.orders_per_day = orders_per_day
+        self.resolution = resolution
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.churn = churn
+        self.seed = seed
+        self.rand = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.connections = set()
+        self._scripted_errors = []
+
+    def delay(self):
+        with self.lock:
+            return max(0.0, self.latency + self.rand.uniform(-self.jitter, self.jitter))
+
+    def fail_next(self, count, status=503):
+        """
+        Answer the next `count` requests with HTTP `status`, before any random error.
+        """
+        with self.lock:
+            self._scripted_errors.extend([status] * count)
+
+    def error_status(self, client_address):
+        """
+        Count a request and return the HTTP status of its simulated failure, or None.
+        """
+        with self.lock:
+            self.requests += 1
+            self.connections.add(client_address)
+            if self._scripted_errors:
+                status = self._scripted_errors.pop(0)
+            elif self.rand.random() < self.error_rate:
+                status = 500
+            else:
+                return None
+            self.errors += 1
+            return status
+
+    def dispatch_seed(self):
+        if not self.churn:
+            return self.seed
+        return self.seed + int(time.time() // self.churn)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "DamasStub/1.0"
+    # Headers and body go out in separate writes; without this every response waits on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        settings = self.server.settings
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        # The operation travels in the action parameter of the SOAP 1.2 Content-Type
+        action = self.headers.get("Content-Type", "").rsplit("/", 1)[-1].strip('"; ')
+
+        status = settings.error_status(self.client_address)
+        time.sleep(settings.delay())
+        if status is not None:
+            self.reply(status, fault_document("Simulated DAMAS failure."))
+            return
+
+        if action == "GetActualDateTime":
+            self.reply(200, actual_date_time_document())
+        elif action == "RunSynchronous":
+            try:
+                envelope = etree.fromstring(body)
+                fid = RUN_SYNCHRONOUS_FID(envelope)
+                params = {param.get("Name"): date.fromisoformat(param.text.strip()) for param in RUN_SYNCHRONOUS_DATE_PARAMS(envelope)}
+                date_from, date_to = params["DateFrom"], params.get("DateTo", params["DateFrom"])
+            except (etree.XMLSyntaxError, KeyError, ValueError, AttributeError) as e:
+                self.reply(400, fault_document(f"Malformed request: {e}"))
+                return
+            seed = settings.dispatch_seed() if fid == DISPATCH_ORDERS_FID else settings.seed
+            document = report_document(fid, date_from, date_to, settings.orders_per_day, settings.resolution, seed)
+            if document is None:
+                self.reply(400, fault_document(f"Unknown FID {fid}."))
+            else:
+                self.reply(200, document)
+        else:
+            self.reply(400, fault_document(f"Unknown action {action}."))
+
+    def reply(self, status, content):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/soap+xml;charset=UTF-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+# Function to start the stand-in on a background thread
+def start_stub_server(settings=None, host="127.0.0.1", port=DEFAULT_PORT, verbose=False):
+    """
+    Serve the stand-in until `shutdown()` is called on the returned server.
+
+    Args:
+        settings (StubSettings | None): The document size, latency and error rate.
+        host (str): The interface to listen on.
+        port (int): The port, 0 for any free one.
+        verbose (bool): Log every request to stderr.
+
+    Returns:
+        ThreadingHTTPServer: The running server; the endpoint is `endpoint_url(server)`.
+    """
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.settings = settings or StubSettings()
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, name="damas-stub-server", daemon=True).start()
+    return server
+
+
+def endpoint_url(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/ws"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve synthetic DAMAS reports locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--orders-per-day", type=int, default=40, help="Dispatch orders per day of the requested range.")
+    parser.add_argument("--resolution", default="PT15M", choices=("PT15M", "PT60M"), help="Resolution of the generation schedule.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds around --latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with HTTP 500.")
+    parser.add_argument("--churn", type=int, default=0, help="Regenerate the dispatch orders every this many seconds.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    args = parser.parse_args(argv)
+
+    settings = StubSettings(args.orders_per_day, args.resolution, args.latency, args.jitter, args.error_rate, args.churn, args.seed)
+    server = start_stub_server(settings, args.host, args.port, args.verbose)
+    print(f"DAMAS stand-in listening on {endpoint_url(server)}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(f"{settings.requests} requests, {settings.errors} simulated errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Synthetic DAMAS response documents for the benchmarks.
+
+The documents follow the structure of the real RunSynchronous responses, and are
+deterministic for a given seed so timings can be compared between runs.
+"""
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from damas.timezones import EPOCH, local_day_seconds, local_midnight_epoch
+
+RESPONSE_HEAD = (
+    '<env:Envelope xmlns:env="http://www.w3.org/2003/05/soap-envelope"><env:Header/><env:Body>'
+    '<ns2:RunSynchronousResponse xmlns:ns2="http://markets.transelectrica.ro/wse"><ns2:Output>'
+    '<ns2:RQID>-1</ns2:RQID><ns2:Result>'
+)
+RESPONSE_TAIL = (
+    '</ns2:Result><ns2:RQState><ns2:Code>COMPLETED</ns2:Code>'
+    '<ns2:Description>The request is completed.</ns2:Description></ns2:RQState>'
+    '</ns2:Output></ns2:RunSynchronousResponse></env:Body></env:Envelope>'
+)
+
+
+def dispatch_orders_document(order_count, first_day=datetime(2024, 12, 8), days=1, seed=0):
+    """
+    Build a DISPATCH_ORDERS_MANUAL_DOWNLOAD_XML_OUT response with `order_count` Bid_TimeSeries.
+    """
+    rng = random.Random(seed)
+    parts = [RESPONSE_HEAD, '<ReserveBid_MarketDocument xmlns="urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2">',
+             '<mRID>DO-SYNTHETIC</mRID><type>A37</type>']
+    for index in range(order_count):
+        start_time = first_day + timedelta(minutes=15 * rng.randrange(0, 96 * days))
+        end_time = start_time + timedelta(minutes=15 * rng.randrange(1, 9))
+        parts.append(
+            f'<Bid_TimeSeries><mRID>{index + 1}</mRID><businessType>A97</businessType>'
+            f'<flowDirection.direction>{rng.choice(("A01", "A02"))}</flowDirection.direction>'
+            f'<quantity_Measure_Unit.name>MAW</quantity_Measure_Unit.name>'
+            f'<Period><timeInterval><start>{start_time:%Y-%m-%dT%H:%MZ}</start><end>{end_time:%Y-%m-%dT%H:%MZ}</end></timeInterval>'
+            f'<resolution>PT15M</resolution>'
+            f'<Point><position>1</position><quantity.quantity>{rng.choice(("0.5", "1.2", "2", "4.3"))}</quantity.quantity></Point>'
+            f'</Period></Bid_TimeSeries>'
+        )
+    parts.append('</ReserveBid_MarketDocument>')
+    parts.append(RESPONSE_TAIL)
+    return "".join(parts).encode("utf-8")
+
+
+def generation_schedule_document(days=1, base_point=4.3, seed=0, first_day=None, resolution="PT15M"):
+    """
+    Build a GENERATION_SCHEDULES_MANUAL_DOWNLOAD_XML_OUT response.
+
+    Without `first_day`, positions run continuously from 1 to 96 * `days` in a single period
+    with no TimeInterval. With it, every local day gets its own Period with a UTC TimeInterval
+    and positions restarting at 1, like the TSO's multi-day responses; DST days get 92 or 100
+    quarters.
+    """
+    rng = random.Random(seed)
+    parts = [RESPONSE_HEAD, '<ns2:ScheduleMessage>', '<ns2:ScheduleTimeSeries>']
+    if first_day is None:
+        periods = [(None, 96 * days)]
+    else:
+        point_seconds = {"PT15M": 900, "PT60M": 3600}[resolution]
+        periods = []
+        for offset in range(days):
+            day = first_day.date() + timedelta(days=offset)
+            start = EPOCH + timedelta(seconds=local_midnight_epoch(day))
+            end = start + timedelta(seconds=local_day_seconds(day))
+            periods.append((f"{start:%Y-%m-%dT%H:%MZ}/{end:%Y-%m-%dT%H:%MZ}", local_day_seconds(day) // point_seconds))
+    for time_interval, point_count in periods:
+        parts.append('<ns2:Period>')
+        if time_interval is not None:
+            parts.append(f'<ns2:TimeInterval v="{time_interval}"/>')
+        parts.append(f'<ns2:Resolution v="{resolution}"/>')
+        for position in range(1, point_count + 1):
+            quantity = base_point if rng.random() < 0.8 else rng.choice((0, 8.6))
+            parts.append(f'<ns2:Interval><ns2:Pos v="{position}"/><ns2:Qty v="{quantity}"/></ns2:Interval>')
+        parts.append('</ns2:Period>')
+    parts.append('</ns2:ScheduleTimeSeries></ns2:ScheduleMessage>')
+    parts.append(RESPONSE_TAIL)
+    return "".join(parts).encode("utf-8")
@@ -0,0 +1,44 @@
+"""
+DAMAS web service client: the SOAP client, the report parsers and the schedule engine.
+
+The Streamlit pages and monitor.py are thin shells over this package. Its submodules can be
+imported without starting a UI, e.g. `from damas.dispatch_service import load_dispatch_data`.
+Names re-exported here are resolved on first access, so `import damas` does not load numpy,
+lxml or requests.
+"""
+import importlib
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "DamasClient": "client",
+    "fetch_report": "client",
+    "fetch_report_async": "client",
+    "get_client": "client",
+    "load_dispatch_data": "dispatch_service",
+    "start_dispatch_poller": "dispatch_service",
+    "today_and_tomorrow": "dispatch_service",
+    "parse_dispatch_orders": "dispatch_orders",
+    "parse_generation_schedule": "schedule_parser",
+    "QuarterHourSchedule": "quarter_hour_schedule",
+    "apply_orders_to_schedule": "schedule_engine",
+    "diff_orders": "order_delta",
+    "LiveScheduleTracker": "order_delta",
+    "convert_utc_to_eet": "timezones",
+    "span": "metrics",
+    "start_metrics_export": "metrics",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,165 @@
+import asyncio
+import functools
+import os
+import re
+import threading
+import time
+
+from damas.metrics import observe_request
+from damas.report_archive import get_archive, is_final_day
+from damas.report_cache import get_cache
+from damas.soap_envelope import build_run_synchronous
+
+# DAMAS_ENDPOINT can point the app at a local stand-in, see benchmarks/stub_server.py
+DAMAS_ENDPOINT = os.environ.get("DAMAS_ENDPOINT", "https://newmarkets.transelectrica.ro/usy-durom-wsendpointg01/00121002300000000000000000000100/ws")
+SOAP_CONTENT_TYPE = 'application/soap+xml;charset=UTF-8;action="http://markets.transelectrica.ro/wse/{action}"'
+
+# Seconds to wait for the TCP/TLS connection and for the report to be produced
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 60
+
+# Seconds an async caller waits for a whole report, retries included
+REPORT_TIMEOUT = 2 * (CONNECT_TIMEOUT + READ_TIMEOUT)
+
+# The RQState code of a report that ran to the end, whatever prefix the response uses
+COMPLETED_STATE = re.compile(rb"<(?:[\w.-]+:)?RQState>\s*<(?:[\w.-]+:)?Code>\s*COMPLETED\s*<")
+
+
+class DamasClient:
+    """
+    A pooled, keep-alive HTTP client for the DAMAS SOAP endpoint.
+
+    One `requests.Session` is shared by every call, so consecutive reports reuse the open
+    TLS connection instead of doing a fresh handshake each time. Connection errors and 5xx
+    answers are retried with exponential backoff.
+    """
+
+    def __init__(self, endpoint=DAMAS_ENDPOINT, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 retries=3, backoff_factor=0.5, pool_maxsize=10):
+        # Imported with the first client rather than with the package, requests is slow to load
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.endpoint = endpoint
+        self.timeout = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            # RunSynchronous only reads reports, so retrying the POST is safe
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session = requests.Session()
+        self._request_error = requests.RequestException
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def post(self, soap_request, action):
+        """
+        Send a SOAP envelope and return the raw response body.
+
+        Args:
+            soap_request (str): The SOAP envelope.
+            action (str): The operation name, e.g. "RunSynchronous" or "GetActualDateTime".
+
+        Returns:
+            bytes | None: The response content, or None if the request failed.
+        """
+        headers = {
+            'Content-Type': SOAP_CONTENT_TYPE.format(action=action),
+        }
+        try:
+            response = self.session.post(self.endpoint, data=soap_request.encode("utf-8"), headers=headers, timeout=self.timeout)
+        except self._request_error as e:
+            print(f"Error: {e}")
+            return None
+
+        if response.status_code == 200:
+            return response.content
+        else:
+            print(f"Error: {response.status_code}, {response.text}")
+            return None
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+# Function to get the DAMAS client shared by the whole process
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = DamasClient()
+        return _client
+
+
+# Function to check that a RunSynchronous response holds a completed report
+def report_completed(content):
+    return COMPLETED_STATE.search(content) is not None
+
+
+# Function to download a report through the shared client and the process-wide cache
+def fetch_report(fid, date_from, date_to, username, password, use_cache=True, use_archive=True):
+    """
+    Run a RunSynchronous report for a date range.
+
+    Args:
+        fid (str): The report FID.
+        date_from (datetime.date | str): The DateFrom parameter.
+        date_to (datetime.date | str): The DateTo parameter.
+        username (str): The first DAMAS access code.
+        password (str): The second DAMAS access code.
+        use_cache (bool): Serve fresh responses from the report cache and share in-flight requests.
+        use_archive (bool): Read and store single finished days in the local archive. Only
+            responses whose RQState is COMPLETED are archived.
+
+    Returns:
+        bytes | None: The response content, or None if the request failed.
+    """
+    def fetch():
+        started = time.perf_counter()
+        soap_request = build_run_synchronous(fid, {"DateFrom": date_from, "DateTo": date_to}, username, password)
+        content = get_client().post(soap_request, "RunSynchronous")
+        # Only real round trips are recorded, cache and archive hits are not
+        observe_request(fid, time.perf_counter() - started, content)
+        return content
+
+    # A finished day never changes, so it is only downloaded once
+    archived_day = use_archive and str(date_from) == str(date_to) and is_final_day(date_from)
+    if archived_day:
+        content = get_archive().load_content(fid, date_from)
+        if content is not None and report_completed(content):
+            return content
+
+    content = get_cache().get(fid, date_from, date_to, fetch) if use_cache else fetch()
+    if archived_day and content is not None and report_completed(content):
+        get_archive().save_content(fid, date_from, content)
+    return content
+
+
+# Function to download a report without blocking the event loop
+async def fetch_report_async(fid, date_from, date_to, username, password, use_cache=True, use_archive=True,
+                             executor=None):
+    """
+    Async variant of `fetch_report`, run on a worker thread of `executor` over the shared pooled session.
+
+    Cancelling the awaiting task returns control to the caller at once; the HTTP request itself
+    still ends at the client's connect/read timeouts, and its result stays in the report cache
+    for the next caller. `asyncio.run` waits for the threads of the loop's default executor
+    before it returns, so a caller that must not wait for an abandoned request passes its own
+    `executor` and shuts it down with wait=False.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(fetch_report, fid, date_from, date_to, username, password, use_cache, use_archive)
+    )
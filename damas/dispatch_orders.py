@@ -0,0 +1,98 @@
+from io import BytesIO
+from typing import NamedTuple
+
+from lxml import etree
+
+RESERVE_BID_NS = "urn:iec62325.351:tc57wg16:451-7:reservebiddocument:7:2"
+BID_TIME_SERIES_TAG = f"{{{RESERVE_BID_NS}}}Bid_TimeSeries"
+PERIOD_TAG = f"{{{RESERVE_BID_NS}}}Period"
+DIRECTION_TAG = f"{{{RESERVE_BID_NS}}}flowDirection.direction"
+START_TAG = f"{{{RESERVE_BID_NS}}}start"
+END_TAG = f"{{{RESERVE_BID_NS}}}end"
+QUANTITY_TAG = f"{{{RESERVE_BID_NS}}}quantity.quantity"
+
+DIRECTIONS = {"A01": "Crestere", "A02": "Scadere"}
+
+
+class DispatchOrder(NamedTuple):
+    """
+    One dispatch order as found in a Bid_TimeSeries.
+
+    `start` and `end` are the UTC timestamps of the first Period, exactly as written in the document.
+    """
+    start: str
+    end: str
+    direction: str
+    quantity: float
+
+    def as_record(self, convert_time):
+        """
+        Return the order in the dict form shown in the tables, with times converted by `convert_time`.
+
+        The UTC times are kept next to the local ones: orders are placed on the schedule by
+        them, since a local time in the hour repeated when the clocks go back is ambiguous.
+        """
+        return {
+            "Ora de Start": convert_time(self.start),
+            "Ora de Sfarsit": convert_time(self.end),
+            "Directia": self.direction,
+            "Cantitatea": self.quantity,
+            "Ora de Start UTC": self.start,
+            "Ora de Sfarsit UTC": self.end,
+        }
+
+
+def _read_bid_time_series(bid_time_series):
+    direction_code = start_time = end_time = quantity = None
+    in_period = False
+    # One pass over the subtree, keeping the first value of each field like .find(".//...") did
+    for element in bid_time_series.iter():
+        tag = element.tag
+        if tag == DIRECTION_TAG and direction_code is None:
+            direction_code = element.text
+        elif tag == PERIOD_TAG:
+            in_period = True
+        elif tag == START_TAG and in_period and start_time is None:
+            start_time = element.text
+        elif tag == END_TAG and in_period and end_time is None:
+            end_time = element.text
+        elif tag == QUANTITY_TAG and quantity is None:
+            quantity = element.text
+    return DispatchOrder(start_time, end_time, DIRECTIONS.get(direction_code, direction_code), float(quantity))
+
+
+# Function to stream the dispatch orders out of a DISPATCH_ORDERS_MANUAL_DOWNLOAD_XML_OUT response
+def iter_dispatch_orders(response):
+    """
+    Yield the dispatch orders of a response as each Bid_TimeSeries element is completed.
+
+    Processed elements are cleared and dropped from the tree, so memory stays flat however
+    many orders a multi-day response holds.
+
+    Args:
+        response (bytes): The SOAP response.
+
+    Yields:
+        DispatchOrder: The orders, in document order.
+    """
+    for _, bid_time_series in etree.iterparse(BytesIO(response), events=("end",), tag=BID_TIME_SERIES_TAG):
+        yield _read_bid_time_series(bid_time_series)
+        bid_time_series.clear()
+        parent = bid_time_series.getparent()
+        while bid_time_series.getprevious() is not None:
+            del parent[0]
+
+
+# Function to parse a response into the order records used by the schedules
+def parse_dispatch_orders(response, convert_time):
+    """
+    Parse a dispatch orders response into dict records.
+
+    Args:
+        response (bytes): The SOAP response.
+        convert_time (Callable[[str], str]): Converts the UTC timestamps to local time.
+
+    Returns:
+        list[dict]: The orders, in document order.
+    """
+    return [order.as_record(convert_time) for order in iter_dispatch_orders(response)]
@@ -0,0 +1,143 @@
+import random
+import threading
+import time
+from typing import Any, NamedTuple, Optional
+
+from damas.log import get_logger
+
+logger = get_logger("dispatch_poller")
+
+# Seconds between two polls of the DAMAS reports
+POLL_INTERVAL = 10 * 60
+
+# Shortest delay between two polls while dispatch orders are active or expected
+MIN_POLL_INTERVAL = 30
+
+
+class Snapshot(NamedTuple):
+    """
+    The result of one poll, shared read-only with every session.
+
+    `data` is whatever the load function returned on the last successful poll; `error` is set
+    when the latest poll failed, in which case `data` still holds the previous result.
+    """
+    version: int
+    fetched_at: float
+    data: Any
+    error: Optional[str]
+
+
+class AdaptiveInterval:
+    """
+    Picks the delay before the next poll from the outcome of the last one.
+
+    While `is_active(data)` holds the poller runs every `min_interval` seconds. Quiet polls and
+    failed polls multiply the delay by `backoff` up to `max_interval`, and a failure never waits
+    less than `min_interval * backoff`. Every delay is spread by +/- `jitter` so several
+    processes do not hit the TSO in lockstep.
+    """
+
+    def __init__(self, is_active, min_interval=MIN_POLL_INTERVAL, max_interval=POLL_INTERVAL,
+                 backoff=2.0, jitter=0.1, rand=random.random):
+        self.is_active = is_active
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.rand = rand
+        self.current = min_interval
+
+    def next_delay(self, snapshot):
+        """
+        Return the seconds to wait after `snapshot` was published.
+        """
+        if snapshot.error is not None:
+            self.current = min(max(self.current, self.min_interval) * self.backoff, self.max_interval)
+        elif self.is_active(snapshot.data):
+            self.current = self.min_interval
+        else:
+            self.current = min(self.current * self.backoff, self.max_interval)
+        return self.current * (1 + self.jitter * (2 * self.rand() - 1))
+
+
+class BackgroundPoller:
+    """
+    Runs a load function on a schedule in one daemon thread and publishes its result as a Snapshot.
+
+    One poller serves the whole server process, so N open sessions cost one poll instead of N.
+    Sessions only read `snapshot()` and never block on the network. `interval` is either a
+    fixed number of seconds or an object with a `next_delay(snapshot)` method, such as
+    AdaptiveInterval.
+    """
+
+    def __init__(self, load, interval=POLL_INTERVAL, name="damas-poller"):
+        self.load = load
+        self.interval = interval
+        self.name = name
+        self._snapshot = None
+        self._condition = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def refresh_now(self):
+        """
+        Ask the poller to poll immediately instead of waiting for the end of the interval.
+        """
+        self._wake.set()
+
+    def snapshot(self):
+        """
+        Return the latest Snapshot, or None before the first poll has finished.
+        """
+        return self._snapshot
+
+    def wait_for_update(self, version, timeout=None):
+        """
+        Block until a snapshot newer than `version` is published, or the timeout expires.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._snapshot is not None and self._snapshot.version > version, timeout)
+            return self._snapshot
+
+    def _publish(self, data, error):
+        with self._condition:
+            version = 1 if self._snapshot is None else self._snapshot.version + 1
+            self._snapshot = Snapshot(version, time.time(), data, error)
+            self._condition.notify_all()
+
+    def _poll_once(self):
+        started = time.perf_counter()
+        try:
+            data = self.load()
+        except Exception as e:
+            logger.exception("event=poll_failed poller=%s", self.name)
+            previous = self._snapshot
+            self._publish(None if previous is None else previous.data, repr(e))
+            return False
+        self._publish(data, None)
+        logger.info("event=poll_completed poller=%s seconds=%.3f", self.name, time.perf_counter() - started)
+        return True
+
+    def _next_delay(self):
+        if isinstance(self.interval, (int, float)):
+            return self.interval
+        return self.interval.next_delay(self._snapshot)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._poll_once()
+            self._wake.wait(self._next_delay())
+            self._wake.clear()
@@ -0,0 +1,260 @@
+"""
+Fetch, parse and apply the DAMAS reports, and the pollers that keep them current.
+
+numpy, lxml, requests and pytz are imported by the functions that need them rather than
+with this module, so the dashboard starts its pollers without waiting for them.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from damas.dispatch_poller import AdaptiveInterval, BackgroundPoller
+from damas.metrics import ORDERS_PARSED, span
+
+# Seconds between two polls of the generation schedule, which the TSO rarely changes
+GENERATION_POLL_INTERVAL = 30 * 60
+
+# Orders starting within this many seconds keep the dispatch poller at its fastest rate
+ACTIVE_ORDER_LOOKAHEAD = 60 * 60
+
+
+# Function to send SOAP request for Generation Schedule
+def get_generation_schedule(date_from, date_to, access_codes):
+    from damas.client import fetch_report
+    from damas.soap_envelope import GENERATION_SCHEDULES_FID
+
+    return fetch_report(GENERATION_SCHEDULES_FID, date_from, date_to, *access_codes)
+
+
+# Function to send SOAP request for dispatch orders
+def get_dispatch_orders(date_from, date_to, access_codes):
+    from damas.client import fetch_report
+    from damas.soap_envelope import DISPATCH_ORDERS_FID
+
+    date_to = date_to - timedelta(days=1)
+    return fetch_report(DISPATCH_ORDERS_FID, date_from, date_to, *access_codes)
+
+
+# Async variant of get_generation_schedule
+async def get_generation_schedule_async(date_from, date_to, access_codes, executor=None):
+    from damas.client import fetch_report_async
+    from damas.soap_envelope import GENERATION_SCHEDULES_FID
+
+    return await fetch_report_async(GENERATION_SCHEDULES_FID, date_from, date_to, *access_codes, executor=executor)
+
+
+# Async variant of get_dispatch_orders
+async def get_dispatch_orders_async(date_from, date_to, access_codes, executor=None):
+    from damas.client import fetch_report_async
+    from damas.soap_envelope import DISPATCH_ORDERS_FID
+
+    date_to = date_to - timedelta(days=1)
+    return await fetch_report_async(DISPATCH_ORDERS_FID, date_from, date_to, *access_codes, executor=executor)
+
+
+def create_tomorrows_generation_schedule():
+    import numpy as np
+
+    from damas.quarter_hour_schedule import QuarterHourSchedule
+    from damas.time_axis import TimeAxis
+
+    axis = TimeAxis.for_local_days(date(2024, 12, 9), date(2024, 12, 9))
+    hours = axis.local_hours()
+    power = np.where((0 <= hours) & (hours <= 24), 4, 0)
+    return QuarterHourSchedule(axis.start, power)
+
+
+def create_2days_ahead_generation_schedule():
+    import numpy as np
+
+    from damas.quarter_hour_schedule import QuarterHourSchedule
+    from damas.time_axis import TimeAxis
+
+    axis = TimeAxis.for_local_days(date(2024, 12, 10), date(2024, 12, 10))
+    hours = axis.local_hours()
+    power = np.where((0 <= hours) & (hours <= 24), 4, 0)
+    return QuarterHourSchedule(axis.start, power)
+
+
+def create_standard_generation_schedule(date_from):
+    from damas.quarter_hour_schedule import QuarterHourSchedule
+
+    # Standard power output for the entire local day, 92 or 100 quarters on DST days
+    return QuarterHourSchedule.for_local_days(date_from, date_from, 4.3)
+
+
+# Function to get today and tomorrow in EET, the range followed by auto-update
+def today_and_tomorrow():
+    from damas.timezones import local_today
+
+    today = local_today()
+    return today, today + timedelta(days=1)
+
+
+# Function to fetch and parse the generation schedule of a date range
+def load_generation_schedule(date_from, date_to, access_codes):
+    from damas.schedule_parser import parse_generation_schedule
+
+    current_date = datetime.now().date()
+    if current_date == datetime(2024, 12, 9).date():
+        return create_tomorrows_generation_schedule()
+    elif current_date == datetime(2024, 12, 8).date():
+        return create_2days_ahead_generation_schedule()
+
+    response_schedule = get_generation_schedule(date_from, date_to, access_codes)
+    if response_schedule:
+        with span("parse_schedule"):
+            return parse_generation_schedule(response_schedule, date_from)
+    return None
+
+
+# Function to fetch the dispatch orders and the generation schedule concurrently
+async def fetch_dispatch_reports(date_from, date_to, access_codes, load_schedule, timeout=None):
+    """
+    Download the dispatch orders while the generation schedule is loaded, so a refresh waits
+    for the slower of the two round trips instead of their sum.
+
+    Returns:
+        tuple[bytes | None, QuarterHourSchedule | None]: The dispatch orders response and the
+        generation schedule.
+
+    A timeout or a cancellation frees the caller at once, `asyncio.run` included: both
+    downloads run on an executor of their own that is shut down without waiting, and a
+    request left behind ends at the client's connect/read timeouts.
+
+    Raises:
+        TimeoutError: Either report took longer than `timeout` seconds, REPORT_TIMEOUT by default.
+    """
+    from damas.client import REPORT_TIMEOUT
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="damas-fetch")
+    try:
+        return await asyncio.wait_for(
+            asyncio.gather(
+                get_dispatch_orders_async(date_from, date_to, access_codes, executor=executor),
+                loop.run_in_executor(executor, load_schedule, date_from, date_to),
+            ),
+            REPORT_TIMEOUT if timeout is None else timeout,
+        )
+    finally:
+        executor.shutdown(wait=False)
+
+
+# Function to fetch and compute the dispatch data of a date range
+def load_dispatch_data(date_from, date_to, access_codes, tracker=None, load_schedule=None):
+    """
+    Fetch the dispatch orders and the generation schedule and compute the live schedule.
+
+    Args:
+        date_from (datetime.date): The first day.
+        date_to (datetime.date): The day after the last one.
+        access_codes (tuple[str, str]): The two DAMAS access codes.
+        tracker (LiveScheduleTracker | None): Keeps the live schedule between polls and reports
+            the order delta; without it the live schedule is computed from scratch.
+        load_schedule (Callable | None): Returns the generation schedule for (date_from, date_to),
+            `load_generation_schedule` by default.
+
+    Returns:
+        dict: date_from, date_to, orders_available, orders, orders_changed (since the tracker's
+        previous update) and live_schedule (QuarterHourSchedule | None).
+    """
+    from damas.dispatch_orders import parse_dispatch_orders
+    from damas.timezones import convert_utc_to_eet
+
+    orders = []
+
+    if load_schedule is None:
+        def load_schedule(date_from, date_to):
+            return load_generation_schedule(date_from, date_to, access_codes)
+
+    # Both reports are fetched at the same time
+    with span("fetch"):
+        response, generation_schedule = asyncio.run(fetch_dispatch_reports(date_from, date_to, access_codes, load_schedule))
+    if response is None and tracker is not None:
+        # Keep the last snapshot instead of reporting every order as cancelled
+        raise RuntimeError("Dispatch orders could not be downloaded.")
+
+    if response:
+        # Stream the orders out of the XML response
+        with span("parse_orders"):
+            orders = parse_dispatch_orders(response, convert_utc_to_eet)
+            if orders:
+                # Sort orders by 'Ora de Start'
+                orders = sorted(orders, key=lambda x: x['Ora de Start'])
+        ORDERS_PARSED.observe(len(orders))
+
+    live_schedule = None
+    orders_changed = False
+    if generation_schedule is not None and len(generation_schedule) > 0:
+        # Process orders and calculate live schedule, recomputing only the slots the new orders touch
+        with span("apply"):
+            if tracker is not None:
+                delta, _ = tracker.update(generation_schedule, orders)
+                orders_changed = bool(delta)
+                live_schedule = tracker.live_schedule
+            else:
+                live_schedule = generation_schedule.apply_orders(orders)
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "orders_available": bool(response),
+        "orders": orders,
+        "orders_changed": orders_changed,
+        "live_schedule": live_schedule,
+    }
+
+
+# Function to tell whether dispatch orders are running, about to start or just changed
+def dispatch_orders_active(data):
+    from damas.timezones import EET_TIMEZONE
+
+    if data is None or data["orders_changed"]:
+        return True
+    now = datetime.now(EET_TIMEZONE)
+    current = now.strftime('%Y-%m-%d %H:%M:%S')
+    horizon = (now + timedelta(seconds=ACTIVE_ORDER_LOOKAHEAD)).strftime('%Y-%m-%d %H:%M:%S')
+    return any(order["Ora de Start"] <= horizon and order["Ora de Sfarsit"] > current for order in data["orders"])
+
+
+# Function to start the pollers that follow today and tomorrow
+def start_dispatch_poller(access_codes):
+    """
+    Start polling dispatch orders adaptively, with the generation schedule on a slower poller.
+
+    Args:
+        access_codes (tuple[str, str]): The two DAMAS access codes.
+
+    Returns:
+        BackgroundPoller: The dispatch poller; its snapshots hold `load_dispatch_data` results.
+    """
+    def load_generation_snapshot():
+        date_from, date_to = today_and_tomorrow()
+        generation_schedule = load_generation_schedule(date_from, date_to, access_codes)
+        if generation_schedule is None:
+            # Keep the last good schedule and retry on the dispatch poller's next miss
+            raise RuntimeError("Generation schedule could not be downloaded.")
+        return date_from, generation_schedule
+
+    generation_poller = BackgroundPoller(load_generation_snapshot, interval=GENERATION_POLL_INTERVAL, name="damas-generation-poller").start()
+
+    def latest_generation_schedule(date_from, date_to):
+        snapshot = generation_poller.wait_for_update(0, timeout=60)
+        if snapshot is not None and snapshot.data is not None and snapshot.data[0] == date_from and snapshot.data[1] is not None:
+            return snapshot.data[1]
+        # The day rolled over or the slow poller has no schedule yet
+        generation_poller.refresh_now()
+        return load_generation_schedule(date_from, date_to, access_codes)
+
+    tracker = None
+
+    def load_dispatch_snapshot():
+        nonlocal tracker
+        if tracker is None:
+            # Created by the first poll, so numpy is imported on the poller thread
+            from damas.order_delta import LiveScheduleTracker
+            tracker = LiveScheduleTracker()
+        return load_dispatch_data(*today_and_tomorrow(), access_codes, tracker=tracker, load_schedule=latest_generation_schedule)
+
+    return BackgroundPoller(load_dispatch_snapshot, interval=AdaptiveInterval(dispatch_orders_active)).start()
@@ -0,0 +1,29 @@
+import logging
+import os
+
+# Level for the damas loggers, e.g. DAMAS_LOG_LEVEL=DEBUG to see per-request details
+LOG_LEVEL = os.environ.get("DAMAS_LOG_LEVEL", "WARNING").upper()
+
+LOG_FORMAT = '%(asctime)s level=%(levelname)s logger=%(name)s %(message)s'
+
+_configured = False
+
+
+# Function to get a logger, configuring the damas loggers on first use
+def get_logger(name):
+    """
+    Return the `damas.<name>` logger.
+
+    The first call gives the "damas" logger its own console handler and level and stops it
+    from propagating; the root logger and the handlers of the host, e.g. Streamlit, are left alone.
+    """
+    global _configured
+    if not _configured:
+        package_logger = logging.getLogger("damas")
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        package_logger.addHandler(handler)
+        package_logger.setLevel(LOG_LEVEL)
+        package_logger.propagate = False
+        _configured = True
+    return logging.getLogger(f"damas.{name}")
@@ -0,0 +1,287 @@
+"""
+Process-wide timing spans and histograms, exported in the Prometheus text format.
+
+Every stage of a refresh runs inside `span(stage)`, and the DAMAS client records the latency
+and size of each report download. Export is off unless configured from the environment:
+
+    DAMAS_METRICS_PORT=9108        serve http://127.0.0.1:9108/metrics
+    DAMAS_METRICS_FILE=metrics.prom  rewrite the file every DAMAS_METRICS_INTERVAL seconds
+"""
+import bisect
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from damas.log import get_logger
+
+logger = get_logger("metrics")
+
+METRICS_PORT = os.environ.get("DAMAS_METRICS_PORT")
+METRICS_HOST = os.environ.get("DAMAS_METRICS_HOST", "127.0.0.1")
+METRICS_FILE = os.environ.get("DAMAS_METRICS_FILE")
+METRICS_INTERVAL = float(os.environ.get("DAMAS_METRICS_INTERVAL", "15"))
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# Spans kept for the debug panel
+RECENT_SPANS = 50
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    """
+    A monotonically increasing count per label set.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [(self.name, _format_labels(self.labels, key), value) for key, value in values]
+
+
+class Histogram:
+    """
+    Observations counted into cumulative buckets per label set, with their sum and the last value.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=SECONDS_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"buckets": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0, "last": 0.0}
+            series["buckets"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+            series["last"] = value
+
+    def series(self):
+        """
+        Return a copy of every series as {label values: {"buckets", "sum", "count", "last"}}.
+        """
+        with self._lock:
+            return {key: {**series, "buckets": list(series["buckets"])} for key, series in sorted(self._series.items())}
+
+    def samples(self):
+        samples = []
+        for key, series in self.series().items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series["buckets"]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", _format_labels(self.labels, key, [("le", _format_value(bound))]), cumulative))
+            samples.append((f"{self.name}_sum", _format_labels(self.labels, key), series["sum"]))
+            samples.append((f"{self.name}_count", _format_labels(self.labels, key), series["count"]))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    The metrics of the process, by name. Registering a name twice returns the first metric.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._recent_spans = deque(maxlen=RECENT_SPANS)
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, help, labels=()):
+        return self._register(Counter, name, help, labels)
+
+    def histogram(self, name, help, labels=(), buckets=SECONDS_BUCKETS):
+        return self._register(Histogram, name, help, labels, buckets)
+
+    def record_span(self, stage, seconds):
+        with self._lock:
+            self._recent_spans.append((time.time(), stage, seconds))
+
+    def recent_spans(self):
+        """
+        Return the latest spans as (epoch, stage, seconds), oldest first.
+        """
+        with self._lock:
+            return list(self._recent_spans)
+
+    def metrics(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render_prometheus(self):
+        """
+        Return every metric in the Prometheus text exposition format.
+        """
+        lines = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram("damas_stage_seconds", "Duration of each refresh stage.", ("stage",))
+REQUEST_SECONDS = REGISTRY.histogram("damas_request_seconds", "Duration of a DAMAS report download, retries included.", ("fid",))
+RESPONSE_BYTES = REGISTRY.histogram("damas_response_bytes", "Size of a DAMAS report response.", ("fid",), BYTES_BUCKETS)
+REQUEST_FAILURES = REGISTRY.counter("damas_request_failures_total", "DAMAS report downloads that returned no response.", ("fid",))
+ORDERS_PARSED = REGISTRY.histogram("damas_orders_parsed", "Dispatch orders in a parsed response.", buckets=COUNT_BUCKETS)
+
+
+# Function to time a block of code as one stage
+@contextmanager
+def span(stage):
+    """
+    Record the duration of the block in damas_stage_seconds, also when it raises.
+
+    Args:
+        stage (str): The stage name, e.g. "fetch", "parse_orders", "apply" or "render".
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        STAGE_SECONDS.observe(seconds, stage=stage)
+        REGISTRY.record_span(stage, seconds)
+
+
+# Function to record one report download
+def observe_request(fid, seconds, content):
+    REQUEST_SECONDS.observe(seconds, fid=fid)
+    if content is None:
+        REQUEST_FAILURES.inc(fid=fid)
+    else:
+        RESPONSE_BYTES.observe(len(content), fid=fid)
+
+
+# Function to summarize the histograms for the debug panel
+def summary_records(registry=REGISTRY):
+    """
+    Return one record per histogram series with its count, last value and mean.
+    """
+    records = []
+    for metric in registry.metrics():
+        if not isinstance(metric, Histogram):
+            continue
+        for key, series in metric.series().items():
+            records.append({
+                "Metrica": metric.name,
+                "Etichete": ", ".join(f"{name}={value}" for name, value in zip(metric.labels, key)),
+                "Numar": series["count"],
+                "Ultima valoare": round(series["last"], 4),
+                "Medie": round(series["sum"] / series["count"], 4),
+            })
+    return records
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Function to serve /metrics on a background thread
+def start_metrics_server(port, host=METRICS_HOST):
+    server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="damas-metrics-server", daemon=True).start()
+    return server
+
+
+# Function to write the metrics to a file, replacing it in one step
+def write_metrics_file(path, registry=REGISTRY):
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, delete=False) as f:
+        f.write(registry.render_prometheus())
+    os.replace(f.name, path)
+
+
+def _write_metrics_file_forever(path, interval):
+    while True:
+        try:
+            write_metrics_file(path)
+        except OSError:
+            logger.exception("event=metrics_file_failed path=%s", path)
+        time.sleep(interval)
+
+
+_export_started = False
+_export_lock = threading.Lock()
+
+
+# Function to start the exports configured in the environment, once per process
+def start_metrics_export(port=METRICS_PORT, path=METRICS_FILE, interval=METRICS_INTERVAL):
+    global _export_started
+    with _export_lock:
+        if _export_started:
+            return
+        _export_started = True
+    if port:
+        try:
+            start_metrics_server(port)
+        except OSError:
+            logger.exception("event=metrics_server_failed port=%s", port)
+    if path:
+        threading.Thread(target=_write_metrics_file_forever, args=(path, interval), name="damas-metrics-file", daemon=True).start()
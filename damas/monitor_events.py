@@ -0,0 +1,140 @@
+"""
+The live schedule in monitor events, and a subscriber that follows a monitor's Unix socket.
+
+With DAMAS_MONITOR_SOCKET set, the dashboard reads the events of a running `monitor.py
+--socket` through MonitorSubscriber instead of polling DAMAS itself, so the alarm path does
+not depend on the Streamlit process.
+"""
+import json
+import socket
+import threading
+import time
+from collections import Counter
+from datetime import date
+
+from damas.dispatch_poller import Snapshot
+from damas.log import get_logger
+from damas.order_delta import order_fingerprint
+from damas.quarter_hour_schedule import QuarterHourSchedule
+
+logger = get_logger("monitor_events")
+
+# Seconds between two attempts to reach the monitor socket
+RECONNECT_DELAY = 5
+
+
+# Function to turn a live schedule into its JSON form in the events
+def schedule_payload(schedule):
+    if schedule is None:
+        return None
+    return {
+        "start": schedule.start,
+        "base_point": schedule.base_point.tolist(),
+        "regulation_band": schedule.regulation_band.tolist(),
+    }
+
+
+# Function to read a live schedule back from an event
+def schedule_from_payload(payload):
+    if payload is None:
+        return None
+    return QuarterHourSchedule(payload["start"], payload["base_point"], payload["regulation_band"])
+
+
+# Function to apply the delta of a "dispatch_orders_changed" event to the orders it follows
+def apply_order_delta(orders, event):
+    """
+    Return the orders after the added, removed and changed orders of `event`.
+    """
+    removed = Counter(order_fingerprint(order) for order in event["removed"])
+    removed.update(order_fingerprint(change["old"]) for change in event["changed"])
+    kept = []
+    for order in orders:
+        fingerprint = order_fingerprint(order)
+        if removed[fingerprint]:
+            removed[fingerprint] -= 1
+        else:
+            kept.append(order)
+    kept += event["added"] + [change["new"] for change in event["changed"]]
+    return sorted(kept, key=lambda x: x['Ora de Start'])
+
+
+class MonitorSubscriber:
+    """
+    Follows the events of a monitor Unix socket and publishes them as poller Snapshots.
+
+    Has the `snapshot()` interface of BackgroundPoller, so the dashboard can use either. The
+    monitor sends a full snapshot to every client that connects, so a reconnect starts over
+    from the monitor's current state.
+    """
+
+    def __init__(self, path, reconnect_delay=RECONNECT_DELAY, name="damas-monitor-subscriber"):
+        self.path = path
+        self.reconnect_delay = reconnect_delay
+        self.name = name
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def snapshot(self):
+        """
+        Return the latest Snapshot, or None before the monitor's first snapshot arrived.
+        """
+        return self._snapshot
+
+    def _publish(self, data, error):
+        with self._lock:
+            version = 1 if self._snapshot is None else self._snapshot.version + 1
+            self._snapshot = Snapshot(version, time.time(), data, error)
+
+    def _apply(self, event):
+        previous = None if self._snapshot is None else self._snapshot.data
+        kind = event["event"]
+        if kind == "poll_failed":
+            self._publish(previous, event.get("error"))
+            return
+        if kind == "dispatch_orders_snapshot":
+            orders = event["orders"]
+        elif previous is None:
+            # A delta without the state it applies to; the next connection starts with a snapshot
+            raise ValueError(f"{kind} event before the first snapshot")
+        elif kind == "dispatch_orders_changed":
+            orders = apply_order_delta(previous["orders"], event)
+        else:
+            orders = previous["orders"]
+        self._publish({
+            "date_from": date.fromisoformat(event["date_from"]),
+            "date_to": date.fromisoformat(event["date_to"]),
+            "orders_available": event["orders_available"],
+            "orders": orders,
+            "orders_changed": kind == "dispatch_orders_changed",
+            "live_schedule": schedule_from_payload(event.get("live_schedule")),
+        }, None)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                    connection.connect(self.path)
+                    for line in connection.makefile("r", encoding="utf-8"):
+                        self._apply(json.loads(line))
+                        if self._stop.is_set():
+                            return
+                raise ConnectionError("The monitor closed the connection.")
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("event=monitor_unavailable path=%s error=%r", self.path, e)
+                previous = self._snapshot
+                self._publish(None if previous is None else previous.data, repr(e))
+            self._stop.wait(self.reconnect_delay)
@@ -0,0 +1,308 @@
+# Generated by wsdl_codegen.py from wsdl/damas.wsdl (sha256 0b3837a54b3d80fd), do not edit.
+"""
+Typed request builders and response decoders for the DAMAS SOAP operations.
+
+Operations: RunSynchronous, GetActualDateTime.
+Request builders return the body element with the `wse` prefix that soap_envelope binds
+to the DAMAS namespace; decoders take the raw response bytes.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import NamedTuple
+from xml.sax.saxutils import escape, quoteattr
+
+from lxml import etree
+
+NAMESPACE = "http://markets.transelectrica.ro/wse"
+PREFIX = "wse"
+ENDPOINT = "https://newmarkets.transelectrica.ro/usy-durom-wsendpointg01/00121002300000000000000000000100/ws"
+SOAP_ACTIONS = {
+    "RunSynchronous": "http://markets.transelectrica.ro/wse/RunSynchronous",
+    "GetActualDateTime": "http://markets.transelectrica.ro/wse/GetActualDateTime",
+}
+
+def _parse_boolean(text):
+    return text.strip() in ("true", "1")
+
+
+def _format_boolean(value):
+    return "true" if value else "false"
+
+
+def _parse_datetime(text):
+    return datetime.fromisoformat(text.strip().replace("Z", "+00:00"))
+
+
+def _format_datetime(value):
+    return value.isoformat().replace("+00:00", "Z") if isinstance(value, datetime) else str(value)
+
+
+def _wrap(tag, content, attributes):
+    if not content:
+        return f"<{PREFIX}:{tag}{attributes}/>"
+    return f"<{PREFIX}:{tag}{attributes}>{content}</{PREFIX}:{tag}>"
+
+
+def _simple(tag, text):
+    return f"<{PREFIX}:{tag}>{escape(text)}</{PREFIX}:{tag}>"
+
+
+def _attribute(name, value):
+    return "" if value is None else f" {name}={quoteattr(str(value))}"
+
+
+def _value_of(text, parse):
+    return None if text is None else parse(text)
+
+
+def _value(child, parse):
+    return None if child is None else parse(child.text or "")
+
+
+def _child(child, decode):
+    return None if child is None else decode(child)
+
+
+class DateParam(NamedTuple):
+    """DateParam of the DAMAS schema."""
+    value: date
+    name: str
+
+
+def _encode_DateParam(tag, value):
+    return _wrap(tag, escape(str(value.value)), _attribute("Name", value.name))
+
+
+def _decode_DateParam(element):
+    return DateParam(
+        value=date.fromisoformat(element.text or ""),
+        name=_value_of(element.get("Name"), str),
+    )
+
+
+class Parameters(NamedTuple):
+    """Parameters of the DAMAS schema."""
+    date_param: list[DateParam] = ()
+
+
+def _encode_Parameters(tag, value):
+    return _wrap(tag, "".join(_encode_DateParam("DateParam", item) for item in value.date_param), "")
+
+
+def _decode_Parameters(element):
+    return Parameters(
+        date_param=[_decode_DateParam(child) for child in element.iterfind("{http://markets.transelectrica.ro/wse}DateParam")],
+    )
+
+
+class RunSynchronousInput(NamedTuple):
+    """RunSynchronousInput of the DAMAS schema."""
+    fid: str
+    parameters: Parameters | None = None
+
+
+def _encode_RunSynchronousInput(tag, value):
+    return _wrap(tag, "".join((
+        _simple("FID", str(value.fid)),
+        ("" if value.parameters is None else _encode_Parameters("Parameters", value.parameters)),
+    )), "")
+
+
+def _decode_RunSynchronousInput(element):
+    return RunSynchronousInput(
+        fid=_value(element.find("{http://markets.transelectrica.ro/wse}FID"), str),
+        parameters=_child(element.find("{http://markets.transelectrica.ro/wse}Parameters"), _decode_Parameters),
+    )
+
+
+class Result(NamedTuple):
+    """Result of the DAMAS schema."""
+    elements: list[etree._Element] = ()
+
+
+def _encode_Result(tag, value):
+    return _wrap(tag, "".join(etree.tostring(item, encoding="unicode") for item in value.elements), "")
+
+
+def _decode_Result(element):
+    return Result(
+        elements=list(element),
+    )
+
+
+class RQState(NamedTuple):
+    """RQState of the DAMAS schema."""
+    code: str
+    description: str | None = None
+
+
+def _encode_RQState(tag, value):
+    return _wrap(tag, "".join((
+        _simple("Code", str(value.code)),
+        ("" if value.description is None else _simple("Description", str(value.description))),
+    )), "")
+
+
+def _decode_RQState(element):
+    return RQState(
+        code=_value(element.find("{http://markets.transelectrica.ro/wse}Code"), str),
+        description=_value(element.find("{http://markets.transelectrica.ro/wse}Description"), str),
+    )
+
+
+class RunSynchronousOutput(NamedTuple):
+    """RunSynchronousOutput of the DAMAS schema."""
+    rqid: int
+    result: Result | None
+    rq_state: RQState
+
+
+def _encode_RunSynchronousOutput(tag, value):
+    return _wrap(tag, "".join((
+        _simple("RQID", str(value.rqid)),
+        ("" if value.result is None else _encode_Result("Result", value.result)),
+        _encode_RQState("RQState", value.rq_state),
+    )), "")
+
+
+def _decode_RunSynchronousOutput(element):
+    return RunSynchronousOutput(
+        rqid=_value(element.find("{http://markets.transelectrica.ro/wse}RQID"), int),
+        result=_child(element.find("{http://markets.transelectrica.ro/wse}Result"), _decode_Result),
+        rq_state=_child(element.find("{http://markets.transelectrica.ro/wse}RQState"), _decode_RQState),
+    )
+
+
+class GetActualDateTimeOutput(NamedTuple):
+    """GetActualDateTimeOutput of the DAMAS schema."""
+    date_time: datetime
+
+
+def _encode_GetActualDateTimeOutput(tag, value):
+    return _wrap(tag, _simple("DateTime", _format_datetime(value.date_time)), "")
+
+
+def _decode_GetActualDateTimeOutput(element):
+    return GetActualDateTimeOutput(
+        date_time=_value(element.find("{http://markets.transelectrica.ro/wse}DateTime"), _parse_datetime),
+    )
+
+
+class RunSynchronous(NamedTuple):
+    """RunSynchronous of the DAMAS schema."""
+    input: RunSynchronousInput
+
+
+def _encode_RunSynchronous(tag, value):
+    return _wrap(tag, _encode_RunSynchronousInput("Input", value.input), "")
+
+
+def _decode_RunSynchronous(element):
+    return RunSynchronous(
+        input=_child(element.find("{http://markets.transelectrica.ro/wse}Input"), _decode_RunSynchronousInput),
+    )
+
+
+class RunSynchronousResponse(NamedTuple):
+    """RunSynchronousResponse of the DAMAS schema."""
+    output: RunSynchronousOutput
+
+
+def _encode_RunSynchronousResponse(tag, value):
+    return _wrap(tag, _encode_RunSynchronousOutput("Output", value.output), "")
+
+
+def _decode_RunSynchronousResponse(element):
+    return RunSynchronousResponse(
+        output=_child(element.find("{http://markets.transelectrica.ro/wse}Output"), _decode_RunSynchronousOutput),
+    )
+
+
+class GetActualDateTime(NamedTuple):
+    """GetActualDateTime of the DAMAS schema."""
+
+
+def _encode_GetActualDateTime(tag, value):
+    return _wrap(tag, "", "")
+
+
+def _decode_GetActualDateTime(element):
+    return GetActualDateTime()
+
+
+class GetActualDateTimeResponse(NamedTuple):
+    """GetActualDateTimeResponse of the DAMAS schema."""
+    output: GetActualDateTimeOutput
+
+
+def _encode_GetActualDateTimeResponse(tag, value):
+    return _wrap(tag, _encode_GetActualDateTimeOutput("Output", value.output), "")
+
+
+def _decode_GetActualDateTimeResponse(element):
+    return GetActualDateTimeResponse(
+        output=_child(element.find("{http://markets.transelectrica.ro/wse}Output"), _decode_GetActualDateTimeOutput),
+    )
+
+
+# Function to serialize a RunSynchronous request into the content of soap:Body
+def encode_run_synchronous(request):
+    """
+    Args:
+        request (RunSynchronous): The request.
+
+    Returns:
+        str: The wse:RunSynchronous element, for soap_envelope.build_envelope.
+    """
+    return _encode_RunSynchronous("RunSynchronous", request)
+
+
+# Function to decode the RunSynchronousResponse out of a SOAP response
+def decode_run_synchronous_response(content):
+    """
+    Args:
+        content (bytes): The SOAP response.
+
+    Returns:
+        RunSynchronousResponse: The decoded response.
+
+    Raises:
+        ValueError: The response holds no RunSynchronousResponse.
+    """
+    root = etree.fromstring(content)
+    element = root if root.tag == "{http://markets.transelectrica.ro/wse}RunSynchronousResponse" else root.find(".//{http://markets.transelectrica.ro/wse}RunSynchronousResponse")
+    if element is None:
+        raise ValueError("No RunSynchronousResponse in the response.")
+    return _decode_RunSynchronousResponse(element)
+
+
+# Function to serialize a GetActualDateTime request into the content of soap:Body
+def encode_get_actual_date_time(request):
+    """
+    Args:
+        request (GetActualDateTime): The request.
+
+    Returns:
+        str: The wse:GetActualDateTime element, for soap_envelope.build_envelope.
+    """
+    return _encode_GetActualDateTime("GetActualDateTime", request)
+
+
+# Function to decode the GetActualDateTimeResponse out of a SOAP response
+def decode_get_actual_date_time_response(content):
+    """
+    Args:
+        content (bytes): The SOAP response.
+
+    Returns:
+        GetActualDateTimeResponse: The decoded response.
+
+    Raises:
+        ValueError: The response holds no GetActualDateTimeResponse.
+    """
+    root = etree.fromstring(content)
+    element = root if root.tag == "{http://markets.transelectrica.ro/wse}GetActualDateTimeResponse" else root.find(".//{http://markets.transelectrica.ro/wse}GetActualDateTimeResponse")
+    if element is None:
+        raise ValueError("No GetActualDateTimeResponse in the response.")
+    return _decode_GetActualDateTimeResponse(element)
@@ -0,0 +1,139 @@
+from collections import Counter
+from typing import NamedTuple
+
+import numpy as np
+
+from damas.quarter_hour_schedule import QuarterHourSchedule, accumulate_offsets
+
+
+# Function to get the identity of a dispatch order
+def order_fingerprint(order):
+    """
+    Return the (UTC start, UTC end, direction, quantity) tuple that identifies a dispatch order.
+    """
+    return (order["Ora de Start UTC"], order["Ora de Sfarsit UTC"], order["Directia"], float(order["Cantitatea"]))
+
+
+class OrderDelta(NamedTuple):
+    """
+    The difference between two snapshots of dispatch orders.
+
+    `changed` holds (old, new) pairs of orders with the same start and direction whose end or
+    quantity was replaced by the TSO; they are not repeated in `added` or `removed`.
+    """
+    added: list
+    removed: list
+    changed: list
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def old_orders(self):
+        return self.removed + [old for old, _ in self.changed]
+
+    def new_orders(self):
+        return self.added + [new for _, new in self.changed]
+
+
+# Function to diff two snapshots of dispatch orders by fingerprint
+def diff_orders(previous, current):
+    """
+    Compare two lists of dispatch orders.
+
+    Orders are compared as multisets of fingerprints, so re-sorting or re-fetching the same
+    orders gives an empty delta. A removed and an added order sharing their start and direction
+    are reported as one changed order.
+
+    Args:
+        previous (list[dict]): The orders of the last snapshot.
+        current (list[dict]): The orders just fetched.
+
+    Returns:
+        OrderDelta: The added, removed and changed orders.
+    """
+    previous_by_fingerprint = {order_fingerprint(order): order for order in previous}
+    current_by_fingerprint = {order_fingerprint(order): order for order in current}
+    previous_counts = Counter(order_fingerprint(order) for order in previous)
+    current_counts = Counter(order_fingerprint(order) for order in current)
+
+    removed = [previous_by_fingerprint[key] for key in (previous_counts - current_counts).elements()]
+    added = [current_by_fingerprint[key] for key in (current_counts - previous_counts).elements()]
+
+    # Pair a removed and an added order with the same start and direction as a change
+    removed_by_identity = {}
+    for order in removed:
+        removed_by_identity.setdefault((order["Ora de Start UTC"], order["Directia"]), []).append(order)
+    changed = []
+    still_added = []
+    for order in added:
+        candidates = removed_by_identity.get((order["Ora de Start UTC"], order["Directia"]))
+        if candidates:
+            changed.append((candidates.pop(0), order))
+        else:
+            still_added.append(order)
+    still_removed = [order for candidates in removed_by_identity.values() for order in candidates]
+    return OrderDelta(still_added, still_removed, changed)
+
+
+class LiveScheduleTracker:
+    """
+    Keeps the live schedule of the last snapshot and updates it from order deltas.
+
+    Only the slots between the first and the last slot touched by the delta are recomputed,
+    so a refresh costs in proportion to the change instead of the size of the range. A new
+    generation schedule on the same slots is diffed slot by slot and keeps the order offsets;
+    one covering other slots makes the update rebuild everything.
+    """
+
+    def __init__(self):
+        self.generation_schedule = None
+        self.orders = []
+        self.offsets = None
+        self.live_schedule = None
+
+    def update(self, generation_schedule, orders):
+        """
+        Bring the live schedule up to date with the latest generation schedule and orders.
+
+        Args:
+            generation_schedule (QuarterHourSchedule): The generation schedule before orders.
+            orders (list[dict]): The current dispatch orders.
+
+        Returns:
+            tuple[OrderDelta, numpy.ndarray]: The order delta against the previous update and the
+            indices of the live schedule slots that changed.
+        """
+        delta = diff_orders(self.orders, orders)
+        self.orders = list(orders)
+
+        previous = self.generation_schedule
+        if previous is None or previous.start != generation_schedule.start or len(previous) != len(generation_schedule):
+            self.generation_schedule = generation_schedule
+            self.offsets = generation_schedule.order_offsets(self.orders)
+            self._publish()
+            return delta, np.arange(len(generation_schedule))
+
+        # The offsets only depend on the orders and the slots, so a new base point keeps them
+        changed = previous.changed_slots(generation_schedule)
+        self.generation_schedule = generation_schedule
+
+        if delta:
+            old_firsts, old_lasts, old_signed = generation_schedule.slot_ranges(delta.old_orders())
+            new_firsts, new_lasts, new_signed = generation_schedule.slot_ranges(delta.new_orders())
+            firsts = np.concatenate([old_firsts, new_firsts])
+            lasts = np.concatenate([old_lasts, new_lasts])
+            signed = np.concatenate([-old_signed, new_signed])
+            first, last = int(firsts.min()), int(max(firsts.max(), lasts.max()))
+            if first < last:
+                window = accumulate_offsets(last - first, firsts - first, lasts - first, signed)
+                self.offsets[first:last] = np.round(self.offsets[first:last] + window, 6)
+                changed = np.union1d(changed, np.arange(first, last))
+
+        if len(changed):
+            self._publish()
+        return delta, changed
+
+    def _publish(self):
+        # A fresh object per update, so snapshots already handed out never change underneath a reader
+        schedule = self.generation_schedule
+        self.live_schedule = QuarterHourSchedule(schedule.start, schedule.base_point + self.offsets, schedule.regulation_band.copy())
@@ -0,0 +1,228 @@
+import numpy as np
+
+from damas.time_axis import SLOT_SECONDS, TimeAxis, format_local_labels, time_axis
+from damas.timezones import local_midnight_epoch, utc_epochs
+
+
+# Function to convert UTC epoch seconds to Europe/Bucharest wall-clock strings in one pass
+def epoch_to_local(epochs):
+    """
+    Convert UTC epoch seconds to "%Y-%m-%d %H:%M:%S" wall-clock strings.
+
+    Args:
+        epochs (numpy.ndarray): int64 epoch seconds.
+
+    Returns:
+        list[str]: The local timestamps.
+    """
+    return format_local_labels(epochs).tolist()
+
+
+# Function to turn order directions and quantities into signed MW values
+def signed_quantities(orders):
+    """
+    Return the quantity of each order, positive for Crestere, negative for Scadere and 0 otherwise.
+    """
+    quantities = np.array([float(order["Cantitatea"]) for order in orders])
+    directions = np.array([order["Directia"] for order in orders])
+    signs = np.select([directions == "Crestere", directions == "Scadere"], [1.0, -1.0], 0.0)
+    return signs * quantities
+
+
+# Function to accumulate order deltas over slot ranges with a difference array
+def accumulate_offsets(slot_count, firsts, lasts, signed):
+    """
+    Add every signed quantity to the slots [first, last) with one cumulative sum.
+
+    Args:
+        slot_count (int): The number of slots.
+        firsts (numpy.ndarray): The first slot of each order.
+        lasts (numpy.ndarray): The slot after the last one of each order.
+        signed (numpy.ndarray): The signed quantity of each order.
+
+    Returns:
+        numpy.ndarray: The net offset of every slot.
+    """
+    deltas = np.zeros(slot_count + 1)
+    np.add.at(deltas, firsts, signed)
+    np.add.at(deltas, lasts, -signed)
+    # Round away the residue left by adding and removing the same quantities
+    return np.round(np.cumsum(deltas[:-1]), 6)
+
+
+class QuarterHourSchedule:
+    """
+    A generation schedule stored as float arrays indexed by 15-minute slot.
+
+    Slot `i` starts at `start + i * SLOT_SECONDS`, where `start` is the UTC epoch of the first
+    slot. The list-of-dicts form with the Romanian column names is only produced at the
+    Streamlit table boundary, by `to_records` and `to_block_records`.
+    """
+
+    __slots__ = ("start", "base_point", "regulation_band")
+
+    def __init__(self, start, base_point, regulation_band=None):
+        self.start = int(start)
+        self.base_point = np.asarray(base_point, dtype=np.float64)
+        if regulation_band is None:
+            regulation_band = np.zeros_like(self.base_point)
+        self.regulation_band = np.asarray(regulation_band, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.base_point)
+
+    def __eq__(self, other):
+        if not isinstance(other, QuarterHourSchedule):
+            return NotImplemented
+        return (
+            self.start == other.start
+            and np.array_equal(self.base_point, other.base_point)
+            and np.array_equal(self.regulation_band, other.regulation_band)
+        )
+
+    def __repr__(self):
+        return f"QuarterHourSchedule(start={self.start}, slots={len(self)})"
+
+    @property
+    def axis(self):
+        return time_axis(self.start, len(self))
+
+    @classmethod
+    def for_local_days(cls, date_from, date_to, base_point):
+        """
+        Create a constant schedule covering the local days from `date_from` to `date_to`, both
+        included, with 92 slots on the spring DST day and 100 on the autumn one.
+
+        Args:
+            date_from (datetime.date): The first local day.
+            date_to (datetime.date): The last local day.
+            base_point (float): The base point in MW.
+        """
+        axis = TimeAxis.for_local_days(date_from, date_to)
+        return cls(axis.start, np.full(len(axis), base_point, dtype=np.float64))
+
+    @classmethod
+    def from_positions(cls, date_from, positions, quantities):
+        """
+        Build a day schedule from the 1-based `Pos` and `Qty` values of a schedule document.
+
+        Args:
+            date_from (datetime.date): The local day the positions are anchored to.
+            positions (Sequence[int]): The 1-based slot positions.
+            quantities (Sequence[float]): The base point for each position, in MW.
+        """
+        start = local_midnight_epoch(date_from)
+        positions = np.asarray(positions, dtype=np.int64)
+        if not len(positions):
+            return cls(start, np.empty(0))
+        base_point = np.zeros(int(positions.max()))
+        base_point[positions - 1] = quantities
+        return cls(start, base_point)
+
+    def to_records(self, first=0, last=None):
+        """
+        Expand the slots [first, last) into the list-of-dicts form used by the Streamlit tables.
+
+        Labels come from the shared time axis, so only the requested page is formatted.
+        """
+        starts, ends = self.axis.labels(first, last)
+        first = min(max(first, 0), len(self))
+        base_points = self.base_point[first:first + len(starts)].tolist()
+        regulation_bands = self.regulation_band[first:first + len(starts)].tolist()
+        return [
+            {
+                "Ora de Inceput": start,
+                "Ora de Sfarsit": end,
+                "Punct de bază [MW]": base_point,
+                "Bandă reglare [MW]": regulation_band,
+            }
+            for start, end, base_point, regulation_band in zip(starts, ends, base_points, regulation_bands)
+        ]
+
+    def change_points(self):
+        """
+        Return the slot indices where a new block of equal base point and band starts.
+        """
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+        changed = (np.diff(self.base_point) != 0) | (np.diff(self.regulation_band) != 0)
+        return np.concatenate(([0], np.flatnonzero(changed) + 1))
+
+    def to_block_records(self):
+        """
+        Merge consecutive slots with the same values into blocks, the form shown as the live schedule.
+
+        Negative base points are shown as 0, like the live schedule always did.
+        """
+        if not len(self):
+            return []
+        firsts = self.change_points()
+        epochs = self.start + np.append(firsts, len(self)) * SLOT_SECONDS
+        labels = epoch_to_local(epochs)
+        base_points = np.maximum(self.base_point[firsts], 0).tolist()
+        regulation_bands = self.regulation_band[firsts].tolist()
+        return [
+            {
+                "Ora de Inceput": labels[i],
+                "Ora de Sfarsit": labels[i + 1],
+                "Punct de bază [MW]": base_points[i],
+                "Bandă reglare [MW]": regulation_bands[i],
+            }
+            for i in range(len(firsts))
+        ]
+
+    def slot_ranges(self, orders):
+        """
+        Map dispatch orders to slot ranges and signed quantities.
+
+        An order covers every slot whose start lies in [Ora de Start UTC, Ora de Sfarsit UTC).
+        The UTC times are used rather than the local ones, which repeat an hour on the
+        100-slot autumn day.
+
+        Args:
+            orders (list[dict]): The dispatch orders, see `DispatchOrder.as_record`.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: First slot, slot after the last,
+            and the signed quantity (positive for Crestere, negative for Scadere, 0 otherwise).
+        """
+        if not orders:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0)
+        order_starts = utc_epochs([order["Ora de Start UTC"] for order in orders])
+        order_ends = utc_epochs([order["Ora de Sfarsit UTC"] for order in orders])
+        # Ceiling division: the first slot starting at or after the order boundary
+        firsts = np.clip(-((self.start - order_starts) // SLOT_SECONDS), 0, len(self))
+        lasts = np.clip(-((self.start - order_ends) // SLOT_SECONDS), 0, len(self))
+        return firsts, lasts, signed_quantities(orders)
+
+    def order_offsets(self, orders):
+        """
+        Return the net dispatch order offset of every slot, accumulated with a difference array.
+        """
+        return accumulate_offsets(len(self), *self.slot_ranges(orders))
+
+    def apply_orders(self, orders):
+        """
+        Return a new schedule with the dispatch orders applied; this schedule is left unchanged.
+        """
+        return QuarterHourSchedule(self.start, self.base_point + self.order_offsets(orders), self.regulation_band.copy())
+
+    def changed_slots(self, other):
+        """
+        Return the indices of the slots, relative to this schedule, whose values differ in `other`.
+
+        Slots outside the range of `other` count as changed.
+        """
+        shift, remainder = divmod(other.start - self.start, SLOT_SECONDS)
+        if remainder:
+            raise ValueError("Schedules are not aligned on the same 15-minute grid.")
+        changed = np.ones(len(self), dtype=bool)
+        first = max(shift, 0)
+        last = min(shift + len(other), len(self))
+        if first < last:
+            changed[first:last] = (
+                (self.base_point[first:last] != other.base_point[first - shift:last - shift])
+                | (self.regulation_band[first:last] != other.regulation_band[first - shift:last - shift])
+            )
+        return np.flatnonzero(changed)
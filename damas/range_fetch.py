@@ -0,0 +1,116 @@
+import calendar
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from damas.order_delta import order_fingerprint
+
+# Default number of report requests in flight at the same time
+MAX_CONCURRENT_REQUESTS = 8
+
+
+# Function to split a date range into single days
+def split_days(date_from, date_to):
+    """
+    Return every day from `date_from` to `date_to`, both included.
+
+    Args:
+        date_from (datetime.date): The first day.
+        date_to (datetime.date): The last day.
+
+    Returns:
+        list[datetime.date]: The days of the range.
+    """
+    return [date_from + timedelta(days=offset) for offset in range((date_to - date_from).days + 1)]
+
+
+# Function to merge per-day order lists, dropping orders returned for more than one day
+def merge_orders(order_lists):
+    """
+    Merge order lists into one list sorted by start time.
+
+    An order spanning midnight is returned for both days it touches. Each order is kept as
+    many times as the day listing it most often has it, so identical orders within one day
+    stay separate, as in a single-response fetch, and only the repeats across days go.
+
+    Args:
+        order_lists (Iterable[list[dict]]): The parsed orders of each day.
+
+    Returns:
+        list[dict]: The de-duplicated orders, sorted by 'Ora de Start'.
+    """
+    merged = {}
+    for orders in order_lists:
+        day = {}
+        for order in orders:
+            day.setdefault(order_fingerprint(order), []).append(order)
+        for fingerprint, copies in day.items():
+            if len(copies) > len(merged.get(fingerprint, ())):
+                merged[fingerprint] = copies
+    return sorted((order for copies in merged.values() for order in copies), key=lambda x: x['Ora de Start'])
+
+
+# Function to fetch and parse a report for every day of a range concurrently
+def fetch_orders_range(fetch_day, parse, date_from, date_to, max_workers=MAX_CONCURRENT_REQUESTS):
+    """
+    Fetch a date range as one request per day, running at most `max_workers` requests at once.
+
+    Every day is parsed from its raw response. With `fetch_report` as the fetcher, finished
+    days are read from the local archive and only the missing or still open days are requested.
+
+    Args:
+        fetch_day (Callable[[str, str], bytes | None]): Sends the request for one day, called
+            with the day as both DateFrom and DateTo ("%Y-%m-%d"). Returns None on failure.
+        parse (Callable[[bytes], list[dict]]): Parses one response into orders.
+        date_from (datetime.date): The first day of the range.
+        date_to (datetime.date): The last day of the range, included.
+        max_workers (int): The concurrency limit.
+
+    Returns:
+        list[dict]: The merged, de-duplicated orders of the whole range.
+    """
+    def fetch_and_parse(day):
+        day_str = day.strftime("%Y-%m-%d")
+        response = fetch_day(day_str, day_str)
+        return parse(response) if response else []
+
+    days = split_days(date_from, date_to)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(days)))) as executor:
+        return merge_orders(executor.map(fetch_and_parse, days))
+
+
+# Function to fetch and parse a report for every day of a month concurrently
+def fetch_month_orders(fetch_day, parse, year, month, max_workers=MAX_CONCURRENT_REQUESTS):
+    """
+    Fetch every day of `month` in `year`, see `fetch_orders_range`.
+    """
+    date_from = date(year, month, 1)
+    date_to = date(year, month, calendar.monthrange(year, month)[1])
+    return fetch_orders_range(fetch_day, parse, date_from, date_to, max_workers=max_workers)
+
+
+# Function to fetch the dispatch orders of every day of a month with the given access codes
+def fetch_month_dispatch_orders(year, month, access_codes, max_workers=MAX_CONCURRENT_REQUESTS):
+    """
+    Fetch and parse DISPATCH_ORDERS_MANUAL_DOWNLOAD_XML_OUT for every day of `month` in `year`.
+
+    Args:
+        year (int): The year.
+        month (int): The month, 1 to 12.
+        access_codes (tuple[str, str]): The two DAMAS access codes.
+        max_workers (int): The concurrency limit.
+
+    Returns:
+        list[dict]: The merged orders of the month, sorted by 'Ora de Start'.
+    """
+    from damas.client import fetch_report
+    from damas.dispatch_orders import parse_dispatch_orders
+    from damas.soap_envelope import DISPATCH_ORDERS_FID
+    from damas.timezones import convert_utc_to_eet
+
+    def fetch_day(date_from, date_to):
+        return fetch_report(DISPATCH_ORDERS_FID, date_from, date_to, *access_codes)
+
+    def parse(response):
+        return parse_dispatch_orders(response, convert_utc_to_eet)
+
+    return fetch_month_orders(fetch_day, parse, year, month, max_workers=max_workers)
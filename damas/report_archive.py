@@ -0,0 +1,77 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from damas.timezones import local_today
+
+# Location of the archive, next to app.py unless DAMAS_ARCHIVE_PATH overrides it
+ARCHIVE_PATH = os.environ.get("DAMAS_ARCHIVE_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "damas_archive.sqlite3"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    fid TEXT NOT NULL,
+    day TEXT NOT NULL,
+    content BLOB NOT NULL,
+    archived_at TEXT NOT NULL,
+    PRIMARY KEY (fid, day)
+)
+"""
+
+
+# Function to check whether a day is over in Europe/Bucharest, so its reports are final
+def is_final_day(day):
+    return str(day) < local_today().isoformat()
+
+
+class ReportArchive:
+    """
+    A local SQLite archive of finished days: the raw XML of each completed report.
+
+    Only days that are over are stored, since the TSO no longer changes their data. Records
+    are not stored: they are parsed again on every read, so a fix to the parser or the time
+    conversion also applies to the days archived before it.
+    """
+
+    def __init__(self, path=ARCHIVE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(_SCHEMA)
+
+    def load_content(self, fid, day):
+        """
+        Return the archived raw response of a report for a day, or None.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT content FROM reports WHERE fid = ? AND day = ?", (fid, str(day))
+            ).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def save_content(self, fid, day, content):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO reports (fid, day, content, archived_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (fid, day) DO UPDATE SET content = excluded.content, archived_at = excluded.archived_at",
+                (fid, str(day), content, datetime.utcnow().isoformat()),
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+# Function to get the archive shared by the whole process
+def get_archive():
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = ReportArchive()
+        return _archive
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from damas.soap_envelope import DISPATCH_ORDERS_FID, GENERATION_SCHEDULES_FID
+from damas.timezones import local_today
+
+# Seconds a response stays fresh, per report FID
+REPORT_TTLS = {
+    # Shorter than the fastest dispatch poll, so active polling always sees fresh orders
+    DISPATCH_ORDERS_FID: 20,
+    GENERATION_SCHEDULES_FID: 300,
+}
+DEFAULT_TTL = 60
+MAX_ENTRIES = 256
+
+
+class ReportCache:
+    """
+    A process-wide LRU cache of raw DAMAS report responses keyed by (FID, DateFrom, DateTo).
+
+    Concurrent requests for the same key share a single in-flight fetch. Reports whose
+    DateTo lies before today (Europe/Bucharest) are final and never expire; the others
+    expire after the TTL of their FID. Failed fetches (None) are not cached.
+    """
+
+    def __init__(self, ttls=None, default_ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES, clock=time.monotonic):
+        self.ttls = dict(REPORT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _expires_at(self, fid, date_to):
+        today = local_today().isoformat()
+        if str(date_to) < today:
+            return float("inf")
+        return self.clock() + self.ttls.get(fid, self.default_ttl)
+
+    def get(self, fid, date_from, date_to, fetch):
+        """
+        Return the cached response for the report, calling `fetch` only on a miss.
+
+        Args:
+            fid (str): The report FID.
+            date_from (datetime.date | str): The DateFrom parameter.
+            date_to (datetime.date | str): The DateTo parameter.
+            fetch (Callable[[], bytes | None]): Downloads the report.
+
+        Returns:
+            bytes | None: The response content, or None if the fetch failed.
+        """
+        key = (fid, str(date_from), str(date_to))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > self.clock():
+                self._entries.move_to_end(key)
+                return entry[0]
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = Future()
+
+        if not leader:
+            return flight.result()
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            flight.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            if value is not None:
+                self._entries[key] = (value, self._expires_at(fid, date_to))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        flight.set_result(value)
+        return value
+
+    def invalidate(self, fid=None):
+        with self._lock:
+            for key in [key for key in self._entries if fid is None or key[0] == fid]:
+                del self._entries[key]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# Function to get the report cache shared by every session of the process
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ReportCache()
+        return _cache
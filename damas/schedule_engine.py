@@ -0,0 +1,25 @@
+import numpy as np
+
+
+# Function to apply dispatch orders to the initial schedule and create live schedule
+def apply_orders_to_schedule(initial_schedule, orders):
+    """
+    Apply the dispatch orders to every slot of a (month-long) schedule in one batched pass.
+
+    Orders become slot-index ranges, the Crestere/Scadere deltas are accumulated with a
+    cumulative sum and the zero clamp is applied once over the whole range. The initial
+    schedule is never modified.
+
+    Clamping once means a slot is clamped on its net result: a Scadere below zero followed
+    by a Crestere nets out in full, where the old per-order clamp lost the part below zero.
+
+    Args:
+        initial_schedule (QuarterHourSchedule): The initial generation schedule.
+        orders (list[dict]): The dispatch orders.
+
+    Returns:
+        QuarterHourSchedule: The live schedule.
+    """
+    live_schedule = initial_schedule.apply_orders(orders)
+    live_schedule.base_point = np.maximum(live_schedule.base_point, 0)  # Ensure no negative values
+    return live_schedule
@@ -0,0 +1,114 @@
+import logging
+
+import numpy as np
+from lxml import etree
+
+from damas.log import get_logger
+from damas.quarter_hour_schedule import SLOT_SECONDS, QuarterHourSchedule
+from damas.timezones import EPOCH, local_midnight_epoch, parse_utc_timestamp
+
+logger = get_logger("schedule_parser")
+
+NAMESPACES = {
+    "soap": "http://www.w3.org/2003/05/soap-envelope",
+    "ns1": "http://markets.transelectrica.ro/wse"
+}
+
+# Compiled once; both select only complete intervals, so the two lists stay aligned
+INTERVAL_POSITIONS = etree.XPath("ns1:Interval[ns1:Pos/@v and ns1:Qty/@v]/ns1:Pos/@v", namespaces=NAMESPACES)
+INTERVAL_QUANTITIES = etree.XPath("ns1:Interval[ns1:Pos/@v and ns1:Qty/@v]/ns1:Qty/@v", namespaces=NAMESPACES)
+INTERVAL_COUNT = etree.XPath("count(//ns1:Interval)", namespaces=NAMESPACES)
+# The elements holding intervals, normally the Periods
+PERIODS = etree.XPath("//ns1:Interval/..", namespaces=NAMESPACES)
+PERIOD_TIME_INTERVAL = etree.XPath("string(ns1:TimeInterval/@v)", namespaces=NAMESPACES)
+PERIOD_RESOLUTION = etree.XPath("string(ns1:Resolution/@v)", namespaces=NAMESPACES)
+
+# Seconds per point for the resolutions the TSO publishes
+RESOLUTIONS = {
+    "PT15M": 15 * 60,
+    "PT30M": 30 * 60,
+    "PT60M": 60 * 60,
+    "PT1H": 60 * 60,
+}
+
+
+def _to_numbers(positions, quantities):
+    try:
+        return np.array(positions, dtype=np.int64), np.array(quantities, dtype=np.float64)
+    except ValueError:
+        # Fall back to skipping the malformed intervals one by one
+        valid = []
+        for position, quantity in zip(positions, quantities):
+            try:
+                valid.append((int(position), float(quantity)))
+            except ValueError as e:
+                logger.warning("event=invalid_interval pos=%r qty=%r error=%r", position, quantity, str(e))
+        return np.array([p for p, _ in valid], dtype=np.int64), np.array([q for _, q in valid], dtype=np.float64)
+
+
+def _period_slots(period, default_start):
+    """
+    Return the UTC epoch of the first slot, the slot offsets and the quantities of one Period.
+
+    The Period is placed by the start of its TimeInterval ("start/end" in UTC), or at
+    `default_start` when it has none. A point of a coarser resolution covers several slots.
+    """
+    time_interval = PERIOD_TIME_INTERVAL(period)
+    if time_interval:
+        start = int((parse_utc_timestamp(time_interval.split("/")[0]) - EPOCH).total_seconds())
+    else:
+        start = default_start
+    resolution = PERIOD_RESOLUTION(period) or "PT15M"
+    if resolution not in RESOLUTIONS:
+        logger.warning("event=unsupported_resolution resolution=%r", resolution)
+        return start, np.empty(0, dtype=np.int64), np.empty(0)
+
+    positions, quantities = _to_numbers(INTERVAL_POSITIONS(period), INTERVAL_QUANTITIES(period))
+    valid = positions >= 1
+    positions, quantities = positions[valid], quantities[valid]
+    slots_per_point = RESOLUTIONS[resolution] // SLOT_SECONDS
+    slots = ((positions - 1) * slots_per_point)[:, None] + np.arange(slots_per_point)
+    return start, slots.reshape(-1), np.repeat(quantities, slots_per_point)
+
+
+def parse_generation_schedule(response_schedule, date_from):
+    """
+    Parse the generation schedule XML response into a QuarterHourSchedule.
+
+    Every Period is placed on one continuous axis by its TimeInterval start and Resolution
+    (PT15M or PT60M), so a response covering several days becomes a single range schedule.
+    Periods without a TimeInterval are anchored at local midnight of `date_from`. Where
+    Periods overlap, the later one wins.
+
+    Args:
+        response_schedule (bytes | str): The XML response.
+        date_from (datetime.date): The starting date for the schedule.
+
+    Returns:
+        QuarterHourSchedule: The parsed generation schedule, empty if the response has no intervals.
+    """
+    if isinstance(response_schedule, str):
+        response_schedule = response_schedule.encode("utf-8")
+    try:
+        root_schedule = etree.fromstring(response_schedule)
+    except etree.XMLSyntaxError as e:
+        logger.error("event=xml_parse_error error=%r", str(e))
+        return QuarterHourSchedule.from_positions(date_from, [], [])
+
+    default_start = local_midnight_epoch(date_from)
+    periods = [_period_slots(period, default_start) for period in PERIODS(root_schedule)]
+    periods = [(start, slots, quantities) for start, slots, quantities in periods if len(slots)]
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("event=parsed root=%s periods=%d intervals=%d complete=%d", root_schedule.tag, len(periods),
+                     int(INTERVAL_COUNT(root_schedule)), sum(len(quantities) for _, _, quantities in periods))
+    if not periods:
+        logger.warning("event=no_intervals root=%s", root_schedule.tag)
+        return QuarterHourSchedule.from_positions(date_from, [], [])
+
+    # One axis from the earliest Period start, then every Period written at its offset
+    start = min(period_start for period_start, _, _ in periods)
+    slots = np.concatenate([slots + (period_start - start) // SLOT_SECONDS for period_start, slots, _ in periods])
+    quantities = np.concatenate([quantities for _, _, quantities in periods])
+    base_point = np.zeros(int(slots.max()) + 1)
+    base_point[slots] = quantities
+    return QuarterHourSchedule(start, base_point)
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape, quoteattr
+
+DISPATCH_ORDERS_FID = "DISPATCH_ORDERS_MANUAL_DOWNLOAD_XML_OUT"
+GENERATION_SCHEDULES_FID = "GENERATION_SCHEDULES_MANUAL_DOWNLOAD_XML_OUT"
+
+# Marks where a value is spliced into the templates below
+_SLOT = "\x00"
+
+_ENVELOPE_TEMPLATE = (
+    '<soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope" xmlns:wse="http://markets.transelectrica.ro/wse">'
+    '<soap:Header>'
+    '<wsse:Security soap:mustUnderstand="true" xmlns:wsse="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd" xmlns:wsu="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-utility-1.0.xsd">'
+    '<wsse:UsernameToken wsu:Id="username_token_id">'
+    '<wsse:Username>\x00</wsse:Username>'
+    '<wsse:Password Type="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-username-token-profile-1.0#PasswordText">\x00</wsse:Password>'
+    '</wsse:UsernameToken>'
+    '<wsu:Timestamp wsu:Id="timestamp_id">'
+    '<wsu:Created>\x00</wsu:Created>'
+    '<wsu:Expires>\x00</wsu:Expires>'
+    '</wsu:Timestamp>'
+    '</wsse:Security>'
+    '</soap:Header>'
+    '<soap:Body>\x00</soap:Body>'
+    '</soap:Envelope>'
+)
+# Splices the same bytes as operations.encode_run_synchronous, without building the typed request
+_RUN_SYNCHRONOUS_TEMPLATE = (
+    '<wse:RunSynchronous><wse:Input><wse:FID>\x00</wse:FID><wse:Parameters>\x00</wse:Parameters></wse:Input></wse:RunSynchronous>'
+)
+
+# The static parts are split once at import, building an envelope only joins strings
+ENVELOPE_PARTS = tuple(_ENVELOPE_TEMPLATE.split(_SLOT))
+RUN_SYNCHRONOUS_PARTS = tuple(_RUN_SYNCHRONOUS_TEMPLATE.split(_SLOT))
+# The same bytes as operations.encode_get_actual_date_time; importing the generated module would load lxml
+GET_ACTUAL_DATE_TIME_BODY = '<wse:GetActualDateTime/>'
+
+
+def _splice(parts, values):
+    pieces = [parts[0]]
+    for value, part in zip(values, parts[1:]):
+        pieces.append(value)
+        pieces.append(part)
+    return "".join(pieces)
+
+
+# Function to get the current timestamp
+def get_current_timestamp(lifetime=timedelta(hours=1)):
+    now = datetime.utcnow()
+    expires = now + lifetime
+    return now.strftime("%Y-%m-%dT%H:%M:%SZ"), expires.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# Function to wrap a SOAP body into the WS-Security envelope
+def build_envelope(body, username, password, lifetime=timedelta(hours=1)):
+    """
+    Build a SOAP 1.2 envelope with a UsernameToken and a fresh Timestamp.
+
+    Args:
+        body (str): The already serialized content of soap:Body.
+        username (str): The first DAMAS access code.
+        password (str): The second DAMAS access code.
+        lifetime (datetime.timedelta): How long the security timestamp stays valid.
+
+    Returns:
+        str: The envelope.
+    """
+    created, expires = get_current_timestamp(lifetime)
+    return _splice(ENVELOPE_PARTS, (escape(username), escape(password), created, expires, body))
+
+
+# Function to build a RunSynchronous request for any report FID
+def build_run_synchronous(fid, date_params, username, password, lifetime=timedelta(hours=1)):
+    """
+    Build the RunSynchronous envelope for a report.
+
+    Args:
+        fid (str): The report FID, e.g. "DISPATCH_ORDERS_MANUAL_DOWNLOAD_XML_OUT".
+        date_params (dict): The DateParam values by name, e.g. {"DateFrom": ..., "DateTo": ...}.
+            Values are formatted with str(), so datetime.date objects can be passed as is.
+        username (str): The first DAMAS access code.
+        password (str): The second DAMAS access code.
+        lifetime (datetime.timedelta): How long the security timestamp stays valid.
+
+    Returns:
+        str: The envelope.
+    """
+    parameters = "".join(
+        f'<wse:DateParam Name={quoteattr(str(name))}>{escape(str(value))}</wse:DateParam>'
+        for name, value in date_params.items()
+    )
+    body = _splice(RUN_SYNCHRONOUS_PARTS, (escape(fid), parameters))
+    return build_envelope(body, username, password, lifetime)
+
+
+# Function to build a GetActualDateTime request
+def build_get_actual_date_time(username, password, lifetime=timedelta(hours=1)):
+    return build_envelope(GET_ACTUAL_DATE_TIME_BODY, username, password, lifetime)
@@ -0,0 +1,105 @@
+from functools import lru_cache
+
+import numpy as np
+
+from damas.timezones import local_day_seconds, local_midnight_epoch, utc_offsets
+
+SLOT_SECONDS = 15 * 60
+
+
+# Function to format UTC epoch seconds as Europe/Bucharest wall-clock labels in one vectorized pass
+def format_local_labels(epochs):
+    """
+    Format UTC epoch seconds as "%Y-%m-%d %H:%M:%S" Europe/Bucharest labels.
+
+    Args:
+        epochs (numpy.ndarray): int64 epoch seconds.
+
+    Returns:
+        numpy.ndarray: A fixed-width unicode array of labels.
+    """
+    epochs = np.asarray(epochs, dtype=np.int64)
+    labels = np.datetime_as_string((epochs + utc_offsets(epochs)).astype("datetime64[s]"), unit="s")
+    if labels.size:
+        # Overwrite the ISO "T" separator in place instead of rebuilding every string
+        labels.reshape(-1).view(np.uint32).reshape(labels.size, -1)[:, 10] = ord(" ")
+    return labels
+
+
+class TimeAxis:
+    """
+    A run of consecutive 15-minute slots starting at the UTC epoch `start`.
+
+    Slot epochs are computed on demand and the wall-clock labels only the first time a table
+    asks for them; `labels` then serves any page of the axis without formatting it again.
+    Get shared instances through `time_axis`.
+    """
+
+    __slots__ = ("start", "slot_count", "_labels")
+
+    def __init__(self, start, slot_count):
+        self.start = int(start)
+        self.slot_count = int(slot_count)
+        self._labels = None
+
+    def __len__(self):
+        return self.slot_count
+
+    def __repr__(self):
+        return f"TimeAxis(start={self.start}, slots={self.slot_count})"
+
+    @classmethod
+    def for_local_days(cls, date_from, date_to):
+        """
+        Return the axis of the local days from `date_from` to `date_to`, both included.
+        """
+        start = local_midnight_epoch(date_from)
+        end = local_midnight_epoch(date_to) + local_day_seconds(date_to)
+        return time_axis(start, (end - start) // SLOT_SECONDS)
+
+    @property
+    def end(self):
+        return self.start + self.slot_count * SLOT_SECONDS
+
+    def epochs(self):
+        """
+        Return the UTC epoch of the start of every slot.
+        """
+        return self.start + np.arange(self.slot_count, dtype=np.int64) * SLOT_SECONDS
+
+    def local_starts(self):
+        """
+        Return the Europe/Bucharest wall-clock start of every slot as datetime64[s].
+        """
+        epochs = self.epochs()
+        return (epochs + utc_offsets(epochs)).astype("datetime64[s]")
+
+    def local_hours(self):
+        """
+        Return the Europe/Bucharest wall-clock hour of every slot.
+        """
+        local_starts = self.local_starts()
+        return (local_starts - local_starts.astype("datetime64[D]")).astype("timedelta64[h]").astype(np.int64)
+
+    def labels(self, first=0, last=None):
+        """
+        Return the start and end labels of the slots [first, last).
+
+        Args:
+            first (int): The first slot.
+            last (int | None): The slot after the last one, the end of the axis if None.
+
+        Returns:
+            tuple[list[str], list[str]]: The start labels and the end labels.
+        """
+        if self._labels is None:
+            self._labels = format_local_labels(self.start + np.arange(self.slot_count + 1, dtype=np.int64) * SLOT_SECONDS)
+        last = self.slot_count if last is None else min(last, self.slot_count)
+        first = min(max(first, 0), last)
+        return self._labels[first:last].tolist(), self._labels[first + 1:last + 1].tolist()
+
+
+# Function to get the axis of a slot range, shared by every schedule and session using the same range
+@lru_cache(maxsize=64)
+def time_axis(start, slot_count):
+    return TimeAxis(start, slot_count)
@@ -0,0 +1,145 @@
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+import numpy as np
+import pytz
+
+EET_TIMEZONE = pytz.timezone('Europe/Bucharest')
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+EPOCH = datetime(1970, 1, 1)
+DAY_SECONDS = 24 * 60 * 60
+
+
+# Function to get the Europe/Bucharest UTC offset of every UTC hour of a day
+@lru_cache(maxsize=4096)
+def _utc_day_offsets(day_number):
+    """
+    Return the 24 UTC offsets, in seconds, of the hours of UTC day `day_number` since the epoch.
+
+    The tz database is only walked hour by hour on the two switchover days of a year; any
+    other day has one offset.
+    """
+    midnight = EPOCH + timedelta(days=day_number)
+    first, last = (
+        int(pytz.utc.localize(midnight + timedelta(hours=hour)).astimezone(EET_TIMEZONE).utcoffset().total_seconds())
+        for hour in (0, 23)
+    )
+    if first == last:
+        return (first,) * 24
+    return tuple(
+        int(pytz.utc.localize(midnight + timedelta(hours=hour)).astimezone(EET_TIMEZONE).utcoffset().total_seconds())
+        for hour in range(24)
+    )
+
+
+# Function to get the UTC offset in force at every wall-clock hour of a local day
+@lru_cache(maxsize=4096)
+def _local_day_offsets(day_number):
+    """
+    Return the 24 UTC offsets, in seconds, of the wall-clock hours of local day `day_number`.
+
+    Wall-clock times repeated when the clocks go back resolve to the later (winter) offset and
+    the hour skipped in spring to the winter offset, like pytz `localize` with is_dst=False.
+    """
+    midnight = EPOCH + timedelta(days=day_number)
+    first, last = (
+        int(EET_TIMEZONE.localize(midnight + timedelta(hours=hour)).utcoffset().total_seconds())
+        for hour in (0, 23)
+    )
+    if first == last:
+        return (first,) * 24
+    return tuple(
+        int(EET_TIMEZONE.localize(midnight + timedelta(hours=hour)).utcoffset().total_seconds())
+        for hour in range(24)
+    )
+
+
+# Function to look up the UTC offsets of many timestamps from the per-day tables
+def _offsets(seconds, day_offsets):
+    seconds = np.asarray(seconds, dtype=np.int64)
+    days, inverse = np.unique(seconds // DAY_SECONDS, return_inverse=True)
+    table = np.array([day_offsets(int(day)) for day in days], dtype=np.int64).reshape(len(days), 24)
+    return table[inverse.reshape(seconds.shape), (seconds % DAY_SECONDS) // 3600]
+
+
+# Function to get the Europe/Bucharest UTC offsets of UTC epoch seconds
+def utc_offsets(epochs):
+    """
+    Return the UTC offset, in seconds, in force at each UTC epoch.
+
+    Args:
+        epochs (numpy.ndarray | Sequence[int]): UTC epoch seconds.
+
+    Returns:
+        numpy.ndarray: int64 offsets, 7200 in winter and 10800 in summer.
+    """
+    return _offsets(epochs, _utc_day_offsets)
+
+
+# Function to parse a UTC timestamp from the DAMAS reports into a naive UTC datetime
+def parse_utc_timestamp(utc_time_str):
+    """
+    Parse "2024-07-01T10:00Z", "2024-07-01T10:00:00Z", "2024-07-01 10:00:00" or a timestamp with
+    an explicit offset in a single pass.
+
+    Returns:
+        datetime.datetime: The naive UTC time.
+    """
+    if utc_time_str.endswith('Z'):
+        utc_time_str = utc_time_str[:-1]
+    utc_time = datetime.fromisoformat(utc_time_str)
+    if utc_time.tzinfo is not None:
+        utc_time = utc_time.astimezone(timezone.utc).replace(tzinfo=None)
+    return utc_time
+
+
+# Function to convert UTC timestamps from the DAMAS reports to epoch seconds
+def utc_epochs(utc_time_strs):
+    """
+    Convert UTC timestamps, in any form `parse_utc_timestamp` reads, to UTC epoch seconds.
+
+    Returns:
+        numpy.ndarray: int64 epoch seconds, one per timestamp.
+    """
+    utc_time_strs = list(utc_time_strs)
+    if all(utc_time_str.endswith('Z') for utc_time_str in utc_time_strs):
+        # The form DAMAS writes, read by numpy in one pass
+        return np.array([utc_time_str[:-1] for utc_time_str in utc_time_strs], dtype="datetime64[s]").astype(np.int64)
+    return np.array([(parse_utc_timestamp(utc_time_str) - EPOCH) // timedelta(seconds=1) for utc_time_str in utc_time_strs], dtype=np.int64)
+
+
+# Function to convert a naive UTC datetime to a naive Europe/Bucharest datetime
+def utc_to_local(utc_time):
+    seconds = (utc_time - EPOCH) // timedelta(seconds=1)
+    return utc_time + timedelta(seconds=_utc_day_offsets(seconds // DAY_SECONDS)[(seconds % DAY_SECONDS) // 3600])
+
+
+# Function to convert UTC time to EET
+def convert_utc_to_eet(utc_time_str):
+    """
+    Convert a UTC timestamp to Europe/Bucharest wall-clock time with the real DST rules.
+
+    Args:
+        utc_time_str (str): The UTC timestamp, see `parse_utc_timestamp`.
+
+    Returns:
+        str: The local time, "%Y-%m-%d %H:%M:%S".
+    """
+    return utc_to_local(parse_utc_timestamp(utc_time_str)).replace(microsecond=0).isoformat(sep=" ")
+
+
+# Function to get the UTC epoch of local midnight at the start of a day
+def local_midnight_epoch(day):
+    local_seconds = (date.fromisoformat(str(day)) - EPOCH.date()).days * DAY_SECONDS
+    return local_seconds - _local_day_offsets(local_seconds // DAY_SECONDS)[0]
+
+
+# Function to get the length of a local day: 23 hours in spring, 25 in autumn, 24 otherwise
+def local_day_seconds(day):
+    day = date.fromisoformat(str(day))
+    return local_midnight_epoch(day + timedelta(days=1)) - local_midnight_epoch(day)
+
+
+# Function to get today's date in Europe/Bucharest
+def local_today():
+    return datetime.now(EET_TIMEZONE).date()
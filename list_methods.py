@@ -1,41 +1,15 @@
-import zeep
-import logging.config
+"""
+Print the DAMAS operations and their messages from the local WSDL copy, without zeep or the
+network. Same as `python wsdl_codegen.py --list`:
 
-# Enable detailed logging for Zeep
-logging.config.dictConfig({
-    'version': 1,
-    'formatters': {
-        'verbose': {
-            'format': '%(name)s: %(message)s'
-        }
-    },
-    'handlers': {
-        'console': {
-            'level': 'DEBUG',
-            'class': 'logging.StreamHandler',
-            'formatter': 'verbose',
-        },
-    },
-    'loggers': {
-        'zeep': {
-            'level': 'DEBUG',
-            'propagate': True,
-            'handlers': ['console'],
-        },
-    }
-})
+    python list_methods.py
+    python list_methods.py --wsdl wsdl/damas_full.wsdl
 
-# WSDL URL
-wsdl = "https://newmarkets.transelectrica.ro/usy-durom-wsendpointg01/00121002300000000000000000000100/ws?wsdl"
+See wsdl/damas.wsdl for saving the service's own description.
+"""
+import sys
 
-# Create Zeep client
-client = zeep.Client(wsdl=wsdl)
+from wsdl_codegen import main
 
-# Print available service methods
-for service in client.wsdl.services.values():
-    for port in service.ports.values():
-        operations = sorted(port.binding._operations.values(), key=lambda operation: operation.name)
-        for operation in operations:
-            print(f"Operation: {operation.name}")
-            print(f"  Input: {operation.input.signature()}")
-            print(f"  Output: {operation.output.signature()}")
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:] + ["--list"]))
@@ -0,0 +1,306 @@
+"""
+Headless dispatch order monitor.
+
+Polls DAMAS like the dashboard does, without Streamlit, and pushes an event to every sink
+whenever dispatch orders are added, cancelled or changed. Run it as a long-lived service:
+
+    python monitor.py --file events.jsonl --webhook https://example.org/hook --socket /tmp/damas.sock
+
+Access codes are read from DAMAS_ACCESS_CODE_1 / DAMAS_ACCESS_CODE_2, or from
+.streamlit/secrets.toml like the dashboard. Each event is one JSON object; the Unix socket
+sink writes one per line to every connected client, e.g. `nc -U /tmp/damas.sock`. Stage
+timings are exported like the dashboard's when DAMAS_METRICS_PORT or DAMAS_METRICS_FILE is set.
+
+The dashboard can follow the monitor instead of polling DAMAS itself:
+
+    DAMAS_MONITOR_SOCKET=/tmp/damas.sock streamlit run app.py
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import threading
+from datetime import datetime
+
+import requests
+
+from damas.dispatch_service import start_dispatch_poller
+from damas.log import get_logger
+from damas.metrics import start_metrics_export
+from damas.monitor_events import schedule_payload
+from damas.order_delta import diff_orders
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+    import toml
+
+logger = get_logger("monitor")
+
+SECRETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".streamlit", "secrets.toml")
+WEBHOOK_TIMEOUT = 10
+# Seconds a socket client may take to accept an event before it is dropped
+SOCKET_SEND_TIMEOUT = 2
+
+
+# Function to read the DAMAS access codes from the environment or the Streamlit secrets file
+def load_access_codes(secrets_path=SECRETS_PATH):
+    code_1 = os.environ.get("DAMAS_ACCESS_CODE_1")
+    code_2 = os.environ.get("DAMAS_ACCESS_CODE_2")
+    if code_1 and code_2:
+        return code_1, code_2
+    if tomllib is None:
+        secrets = toml.load(secrets_path)
+    else:
+        with open(secrets_path, "rb") as f:
+            secrets = tomllib.load(f)
+    return secrets["ACCESS_CODE_1"], secrets["ACCESS_CODE_2"]
+
+
+# Function to build the event published for a snapshot
+def order_event(event, data, delta=None, error=None):
+    """
+    Build a JSON-serializable event.
+
+    Args:
+        event (str): "dispatch_orders_snapshot", "dispatch_orders_changed", "live_schedule_changed"
+            or "poll_failed".
+        data (dict | None): The `load_dispatch_data` result.
+        delta (OrderDelta | None): The orders changed since the previous snapshot.
+        error (str | None): The error of a failed poll.
+    """
+    payload = {"event": event, "emitted_at": datetime.now().astimezone().isoformat(timespec="seconds")}
+    if data is not None:
+        payload.update({
+            "date_from": data["date_from"].isoformat(),
+            "date_to": data["date_to"].isoformat(),
+            "orders_available": data["orders_available"],
+            "order_count": len(data["orders"]),
+            "live_schedule": schedule_payload(data["live_schedule"]),
+        })
+    if event == "dispatch_orders_snapshot" and data is not None:
+        payload["orders"] = data["orders"]
+    if delta is not None:
+        payload.update({
+            "added": delta.added,
+            "removed": delta.removed,
+            "changed": [{"old": old, "new": new} for old, new in delta.changed],
+        })
+    if error is not None:
+        payload["error"] = error
+    return payload
+
+
+class FileSink:
+    """
+    Appends every event as one JSON line to a file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, event):
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def close(self):
+        pass
+
+
+class WebhookSink:
+    """
+    POSTs every event as JSON to a URL.
+    """
+
+    def __init__(self, url, timeout=WEBHOOK_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, event):
+        response = self.session.post(self.url, json=event, timeout=self.timeout)
+        response.raise_for_status()
+
+    def close(self):
+        self.session.close()
+
+
+class UnixSocketSink:
+    """
+    Listens on a Unix socket and writes every event as one JSON line to each connected client.
+
+    A client connecting later first receives the event returned by `welcome`, e.g. the current
+    snapshot, then only new events. `lock` is held while the welcome event is built and the
+    client registered, and by `send`; a publisher that updates its state and sends under the
+    same lock gives every client exactly the events after its snapshot. Clients that
+    disconnect, or do not take an event within `send_timeout` seconds, are dropped, so a
+    stalled reader never holds up the monitor.
+    """
+
+    def __init__(self, path, welcome=None, send_timeout=SOCKET_SEND_TIMEOUT, lock=None):
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Unix sockets are not supported on this platform.")
+        self.path = path
+        self.welcome = welcome
+        self.send_timeout = send_timeout
+        if os.path.exists(path):
+            os.unlink(path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(path)
+        self._server.listen()
+        self._clients = []
+        self._lock = threading.RLock() if lock is None else lock
+        threading.Thread(target=self._accept, name="damas-monitor-socket", daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return
+            client.settimeout(self.send_timeout)
+            with self._lock:
+                event = None if self.welcome is None else self.welcome()
+                self._clients.append(client)
+                if event is not None:
+                    self._send_to(client, self._encode(event))
+
+    def _encode(self, event):
+        return (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def _send_to(self, client, line):
+        try:
+            client.sendall(line)
+        except OSError as e:
+            # A timeout leaves a partial line behind, so the client cannot be kept either way
+            logger.warning("event=socket_client_dropped error=%r", e)
+            self._clients.remove(client)
+            client.close()
+
+    def send(self, event):
+        line = self._encode(event)
+        with self._lock:
+            for client in list(self._clients):
+                self._send_to(client, line)
+
+    def close(self):
+        self._server.close()
+        with self._lock:
+            for client in self._clients:
+                client.close()
+            self._clients.clear()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class DispatchMonitor:
+    """
+    Follows the dispatch poller and publishes an event to every sink for each change.
+
+    The first snapshot is published whole as "dispatch_orders_snapshot"; after that only
+    snapshots whose orders changed produce "dispatch_orders_changed", and snapshots whose live
+    schedule alone changed produce "live_schedule_changed". The delta is taken against the
+    orders last published, so no change is lost when several polls complete while a slow sink
+    is busy. A failing poll is reported once as "poll_failed" until a poll succeeds again.
+
+    `publish_lock` is held while the published state changes and its event goes out; socket
+    sinks share it, so a client connecting meanwhile gets either the old snapshot and the
+    event or the new snapshot alone.
+    """
+
+    def __init__(self, access_codes, sinks):
+        self.access_codes = access_codes
+        self.sinks = sinks
+        self.publish_lock = threading.RLock()
+        self._published = None
+        self._stop = threading.Event()
+
+    def snapshot_event(self):
+        """
+        Return the last published state as a "dispatch_orders_snapshot" event, or None.
+        """
+        data = self._published
+        return None if data is None else order_event("dispatch_orders_snapshot", data)
+
+    def publish(self, event, data=None):
+        """
+        Send `event` to every sink, recording `data` as the published state in the same step.
+        """
+        with self.publish_lock:
+            if data is not None:
+                self._published = data
+            for sink in self.sinks:
+                try:
+                    sink.send(event)
+                except Exception:
+                    logger.exception("event=sink_failed sink=%s", type(sink).__name__)
+
+    def run(self):
+        poller = start_dispatch_poller(self.access_codes)
+        version = 0
+        failing = False
+        try:
+            while not self._stop.is_set():
+                snapshot = poller.wait_for_update(version, timeout=1)
+                if snapshot is None or snapshot.version == version:
+                    continue
+                version = snapshot.version
+                if snapshot.error is not None:
+                    if not failing:
+                        self.publish(order_event("poll_failed", snapshot.data, error=snapshot.error))
+                    failing = True
+                    continue
+                failing = False
+                data = snapshot.data
+                # Only this thread changes the published state, so it is read without the lock
+                published = self._published
+                if published is None:
+                    self.publish(order_event("dispatch_orders_snapshot", data), data)
+                    continue
+                delta = diff_orders(published["orders"], data["orders"])
+                if delta:
+                    logger.info("event=orders_changed added=%d removed=%d changed=%d",
+                                len(delta.added), len(delta.removed), len(delta.changed))
+                    self.publish(order_event("dispatch_orders_changed", data, delta=delta), data)
+                elif data["live_schedule"] != published["live_schedule"]:
+                    self.publish(order_event("live_schedule_changed", data), data)
+        finally:
+            poller.stop(timeout=5)
+            for sink in self.sinks:
+                sink.close()
+
+    def stop(self):
+        self._stop.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch DAMAS dispatch orders and push change events.")
+    parser.add_argument("--file", action="append", default=[], help="Append events as JSON lines to this file.")
+    parser.add_argument("--webhook", action="append", default=[], help="POST events as JSON to this URL.")
+    parser.add_argument("--socket", action="append", default=[], help="Serve events on this Unix socket path.")
+    parser.add_argument("--secrets", default=SECRETS_PATH, help="The secrets.toml holding ACCESS_CODE_1 and ACCESS_CODE_2.")
+    args = parser.parse_args(argv)
+
+    if not (args.file or args.webhook or args.socket):
+        parser.error("at least one of --file, --webhook or --socket is required")
+
+    sinks = [FileSink(path) for path in args.file]
+    sinks += [WebhookSink(url) for url in args.webhook]
+    monitor = DispatchMonitor(load_access_codes(args.secrets), sinks)
+    # Subscribers such as the dashboard start from the current state when they connect
+    sinks += [UnixSocketSink(path, welcome=monitor.snapshot_event, lock=monitor.publish_lock) for path in args.socket]
+
+    start_metrics_export()
+    signal.signal(signal.SIGTERM, lambda *_: monitor.stop())
+    try:
+        monitor.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import math
+
+import streamlit as st
+
+# Rows sent to the browser per page of a detailed table
+PAGE_SIZE = 96
+
+SUMMARY_VIEW = "Rezumat"
+DETAILED_VIEW = "Detaliat"
+
+
+# Function to get the row range of a page
+def page_bounds(row_count, page, page_size=PAGE_SIZE):
+    """
+    Return the first row and the row after the last one of a 1-based page.
+
+    Pages outside the table are clamped to the first or the last page.
+    """
+    page_count = max(1, math.ceil(row_count / page_size))
+    page = min(max(int(page), 1), page_count)
+    first = (page - 1) * page_size
+    return first, min(first + page_size, row_count)
+
+
+# Function to render a page selector and return the chosen row range
+def select_page(row_count, key, page_size=PAGE_SIZE):
+    page_count = max(1, math.ceil(row_count / page_size))
+    if page_count == 1:
+        return 0, row_count
+    page = st.number_input(f"Pagina (din {page_count})", min_value=1, max_value=page_count, value=1, step=1, key=f"{key}_page")
+    return page_bounds(row_count, page, page_size)
+
+
+# Function to render a schedule as merged blocks, or as quarter-hour slots page by page
+def render_schedule(schedule, key, page_size=PAGE_SIZE):
+    """
+    Render a QuarterHourSchedule with st.dataframe, whose grid only draws the visible rows.
+
+    The summary shows one row per block of equal values; picking a block drills down to its
+    quarter-hour slots. The detailed view sends one page of slots at a time, so the payload
+    does not grow with the length of the range.
+
+    Args:
+        schedule (QuarterHourSchedule): The schedule to show.
+        key (str): A prefix for the widget keys, unique on the page.
+        page_size (int): The number of slots per page in the detailed view.
+    """
+    view = st.radio("Afișare", (SUMMARY_VIEW, DETAILED_VIEW), horizontal=True, key=f"{key}_view", label_visibility="collapsed")
+    if view == SUMMARY_VIEW:
+        blocks = schedule.to_block_records()
+        st.dataframe(blocks, hide_index=True)
+        if len(blocks) > 1:
+            block = st.selectbox(
+                "Detalii interval",
+                range(len(blocks)),
+                index=None,
+                format_func=lambda i: f'{blocks[i]["Ora de Inceput"]} - {blocks[i]["Ora de Sfarsit"]}',
+                key=f"{key}_block",
+            )
+            if block is not None:
+                firsts = schedule.change_points().tolist() + [len(schedule)]
+                st.dataframe(schedule.to_records(firsts[block], firsts[block + 1]), hide_index=True)
+    else:
+        first, last = select_page(len(schedule), key, page_size)
+        st.dataframe(schedule.to_records(first, last), hide_index=True)
+
+
+# Function to render a list of records page by page
+def render_records(records, key, page_size=PAGE_SIZE):
+    """
+    Render list-of-dicts records with st.dataframe, one page at a time.
+    """
+    first, last = select_page(len(records), key, page_size)
+    st.dataframe(records[first:last], hide_index=True)
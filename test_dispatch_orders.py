@@ -1,5 +1,6 @@
 import streamlit as st
-import requests
+from damas.client import fetch_report
+from damas.soap_envelope import DISPATCH_ORDERS_FID
 from lxml import etree
 from datetime import datetime, timedelta
 import time
@@ -11,56 +12,9 @@ st.set_page_config(page_title="Client Web Service Damas", layout="wide")
 ACCESS_CODE_1 = "electro1"
 ACCESS_CODE_2 = "giurgiu2012"
 
-# Function to get the current timestamp
-def get_current_timestamp():
-    now = datetime.utcnow()
-    expires = now + timedelta(hours=1)
-    return now.strftime("%Y-%m-%dT%H:%M:%SZ"), expires.strftime("%Y-%m-%dT%H:%M:%SZ")
-
 # Function to send SOAP request for dispatch orders
 def get_dispatch_orders(date_from, date_to):
-    created, expires = get_current_timestamp()
-    
-    # SOAP request XML
-    soap_request = f"""
-    <soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope" xmlns:wse="http://markets.transelectrica.ro/wse">
-        <soap:Header>
-            <wsse:Security soap:mustUnderstand="true" xmlns:wsse="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd" xmlns:wsu="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-utility-1.0.xsd">
-                <wsse:UsernameToken wsu:Id="username_token_id">
-                    <wsse:Username>{ACCESS_CODE_1}</wsse:Username>
-                    <wsse:Password Type="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-username-token-profile-1.0#PasswordText">{ACCESS_CODE_2}</wsse:Password>
-                </wsse:UsernameToken>
-                <wsu:Timestamp wsu:Id="timestamp_id">
-                    <wsu:Created>{created}</wsu:Created>
-                    <wsu:Expires>{expires}</wsu:Expires>
-                </wsu:Timestamp>
-            </wsse:Security>
-        </soap:Header>
-        <soap:Body>
-            <wse:RunSynchronous>
-                <wse:Input>
-                    <wse:FID>DISPATCH_ORDERS_MANUAL_DOWNLOAD_XML_OUT</wse:FID>
-                    <wse:Parameters>
-                        <wse:DateParam Name="DateFrom">{date_from}</wse:DateParam>
-                        <wse:DateParam Name="DateTo">{date_to}</wse:DateParam>
-                    </wse:Parameters>
-                </wse:Input>
-            </wse:RunSynchronous>
-        </soap:Body>
-    </soap:Envelope>
-    """
-
-    headers = {
-        'Content-Type': 'application/soap+xml;charset=UTF-8;action="http://markets.transelectrica.ro/wse/RunSynchronous"',
-    }
-
-    # Send the SOAP request
-    response = requests.post("https://newmarkets.transelectrica.ro/usy-durom-wsendpointg01/00121002300000000000000000000100/ws", data=soap_request, headers=headers)
-
-    if response.status_code == 200:
-        return response.content
-    else:
-        return None
+    return fetch_report(DISPATCH_ORDERS_FID, date_from, date_to, ACCESS_CODE_1, ACCESS_CODE_2)
 
 # Main section
 st.title("Client Web Service Damas")
@@ -0,0 +1,124 @@
+"""
+DamasClient against the offline stand-in of benchmarks/stub_server.py.
+
+Run with:
+    python -m pytest -q
+"""
+import os
+import sys
+import time
+from datetime import date
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from damas import client as damas_client
+from damas import report_archive
+from damas.client import DamasClient, fetch_report, report_completed
+from damas.operations import GetActualDateTime, encode_get_actual_date_time
+from damas.soap_envelope import (
+    DISPATCH_ORDERS_FID, GET_ACTUAL_DATE_TIME_BODY, build_get_actual_date_time, build_run_synchronous,
+)
+from stub_server import ENVELOPE_HEAD, ENVELOPE_TAIL, StubSettings, endpoint_url, start_stub_server
+
+DAY = date(2024, 12, 8)
+
+
+@pytest.fixture
+def stub():
+    settings = StubSettings(orders_per_day=5)
+    server = start_stub_server(settings, port=0)
+    yield settings, endpoint_url(server)
+    server.shutdown()
+    server.server_close()
+
+
+def run_synchronous():
+    return build_run_synchronous(DISPATCH_ORDERS_FID, {"DateFrom": DAY, "DateTo": DAY}, "stub", "stub")
+
+
+def test_post_returns_the_report(stub):
+    settings, endpoint = stub
+    client = DamasClient(endpoint)
+    content = client.post(run_synchronous(), "RunSynchronous")
+    client.close()
+    assert b"<ns2:Code>COMPLETED</ns2:Code>" in content
+    assert settings.requests == 1
+
+
+def test_keep_alive_reuses_one_connection(stub):
+    settings, endpoint = stub
+    client = DamasClient(endpoint)
+    for _ in range(3):
+        assert client.post(run_synchronous(), "RunSynchronous") is not None
+    assert client.post(build_get_actual_date_time("stub", "stub"), "GetActualDateTime") is not None
+    client.close()
+    assert settings.requests == 4
+    assert len(settings.connections) == 1
+
+
+def test_5xx_is_retried_with_backoff(stub):
+    settings, endpoint = stub
+    settings.fail_next(2, status=503)
+    client = DamasClient(endpoint, retries=3, backoff_factor=0.1)
+    started = time.perf_counter()
+    content = client.post(run_synchronous(), "RunSynchronous")
+    elapsed = time.perf_counter() - started
+    client.close()
+    assert content is not None
+    assert settings.requests == 3
+    # urllib3 sleeps backoff_factor * 2 ** (errors - 1) from the second consecutive error on
+    assert elapsed >= 0.2
+
+
+def test_gives_up_after_the_last_retry(stub):
+    settings, endpoint = stub
+    settings.fail_next(10, status=503)
+    client = DamasClient(endpoint, retries=2, backoff_factor=0)
+    assert client.post(run_synchronous(), "RunSynchronous") is None
+    client.close()
+    assert settings.requests == 3
+
+
+def test_read_timeout_is_not_retried(stub):
+    settings, endpoint = stub
+    settings.latency = 1.0
+    client = DamasClient(endpoint, read_timeout=0.2, retries=3, backoff_factor=0)
+    started = time.perf_counter()
+    assert client.post(run_synchronous(), "RunSynchronous") is None
+    elapsed = time.perf_counter() - started
+    client.close()
+    # A slow report is not requested again, the POST may already be running on the server
+    assert elapsed < 0.9
+    assert settings.requests == 1
+
+
+def test_connection_errors_return_none():
+    client = DamasClient("http://127.0.0.1:9/ws", connect_timeout=0.5, retries=1, backoff_factor=0)
+    assert client.post(run_synchronous(), "RunSynchronous") is None
+    client.close()
+
+
+def test_inlined_get_actual_date_time_matches_the_generated_encoder():
+    assert GET_ACTUAL_DATE_TIME_BODY == encode_get_actual_date_time(GetActualDateTime())
+
+
+def test_report_completed_reads_the_rq_state():
+    state = '<ns2:Output><ns2:RQID>1</ns2:RQID><ns2:RQState><ns2:Code>{}</ns2:Code></ns2:RQState></ns2:Output>'
+    assert report_completed(f"{ENVELOPE_HEAD}{state.format('COMPLETED')}{ENVELOPE_TAIL}".encode())
+    assert not report_completed(f"{ENVELOPE_HEAD}{state.format('FAILED')}{ENVELOPE_TAIL}".encode())
+
+
+def test_finished_days_are_served_from_the_archive(stub, tmp_path, monkeypatch):
+    settings, endpoint = stub
+    monkeypatch.setattr(damas_client, "_client", DamasClient(endpoint))
+    monkeypatch.setattr(report_archive, "_archive", report_archive.ReportArchive(str(tmp_path / "archive.sqlite3")))
+    first = fetch_report(DISPATCH_ORDERS_FID, DAY, DAY, "stub", "stub", use_cache=False)
+    second = fetch_report(DISPATCH_ORDERS_FID, DAY, DAY, "stub", "stub", use_cache=False)
+    assert first == second
+    assert settings.requests == 1
+    damas_client._client.close()
+    report_archive._archive.close()
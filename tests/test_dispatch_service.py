@@ -0,0 +1,79 @@
+"""
+Concurrent report fetches of damas.dispatch_service, without the network.
+
+Run with:
+    python -m pytest -q
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from datetime import date
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from damas import client as damas_client
+from damas import dispatch_service
+from damas.quarter_hour_schedule import QuarterHourSchedule
+from synthetic_documents import dispatch_orders_document
+
+DATE_FROM = date(2024, 12, 8)
+DATE_TO = date(2024, 12, 9)
+
+
+def test_reports_are_fetched_concurrently(monkeypatch):
+    def fetch_report(*args, **kwargs):
+        time.sleep(0.3)
+        return b"orders"
+
+    def load_schedule(date_from, date_to):
+        time.sleep(0.3)
+        return "schedule"
+
+    monkeypatch.setattr(damas_client, "fetch_report", fetch_report)
+    started = time.perf_counter()
+    result = asyncio.run(dispatch_service.fetch_dispatch_reports(DATE_FROM, DATE_TO, ("a", "b"), load_schedule))
+    assert result == [b"orders", "schedule"]
+    assert time.perf_counter() - started < 0.55
+
+
+def test_timeout_frees_the_caller_at_once(monkeypatch):
+    release = threading.Event()
+
+    def stuck(*args, **kwargs):
+        release.wait(5)
+
+    monkeypatch.setattr(damas_client, "fetch_report", stuck)
+    started = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        asyncio.run(dispatch_service.fetch_dispatch_reports(DATE_FROM, DATE_TO, ("a", "b"), stuck, timeout=0.2))
+    elapsed = time.perf_counter() - started
+    release.set()
+    # asyncio.run returns without waiting for the abandoned downloads
+    assert elapsed < 1
+
+
+def test_failed_schedule_download_is_fetched_again_by_the_dispatch_poll(monkeypatch):
+    schedules = [None, QuarterHourSchedule.for_local_days(DATE_FROM, DATE_TO, 4.3)]
+    calls = []
+
+    def load_generation_schedule(date_from, date_to, access_codes):
+        calls.append(date_from)
+        return schedules[min(len(calls), len(schedules)) - 1]
+
+    monkeypatch.setattr(damas_client, "fetch_report", lambda *args, **kwargs: dispatch_orders_document(5))
+    monkeypatch.setattr(dispatch_service, "load_generation_schedule", load_generation_schedule)
+    monkeypatch.setattr(dispatch_service, "today_and_tomorrow", lambda: (DATE_FROM, DATE_TO))
+    poller = dispatch_service.start_dispatch_poller(("a", "b"))
+    snapshot = poller.wait_for_update(0, timeout=30)
+    poller.stop(timeout=5)
+    # The generation poller's failure is not published as a day without a schedule
+    assert snapshot.error is None
+    assert len(snapshot.data["orders"]) == 5
+    assert snapshot.data["live_schedule"] is not None
+    assert len(calls) >= 2
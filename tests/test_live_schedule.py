@@ -0,0 +1,103 @@
+"""
+Parity of the live schedule with the original per-interval loop of app.py.
+
+The reference and the random schedule and order generators live in
+benchmarks/bench_live_schedule.py, which times the same comparison.
+
+Run with:
+    python -m pytest -q
+"""
+import os
+import random
+import sys
+from bisect import bisect_right
+from datetime import date, datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_live_schedule import make_order, make_orders, make_schedule, reference_process_orders_and_calculate_schedule
+from damas.order_delta import LiveScheduleTracker
+from damas.quarter_hour_schedule import QuarterHourSchedule
+
+# Sums of these are exact in binary, so both implementations split the blocks at the same slots
+EXACT_BASE_POINTS = (4.25, 4.25, 8.5, 0)
+EXACT_QUANTITIES = ("0.25", "0.75", "1.5", "2", "4.25", "8.5")
+
+
+# Function to run the reference on a schedule, in the list-of-dicts form it was written for
+def reference_blocks(schedule, orders):
+    blocks, schedule_changed = reference_process_orders_and_calculate_schedule(schedule.to_records(), orders)
+    # An order on the first slot makes the reference open with an empty block at the base point
+    return [block for block in blocks if block["Ora de Inceput"] != block["Ora de Sfarsit"]], schedule_changed
+
+
+# Function to derive the reference's schedule_changed flag: the power changes somewhere, or already on slot 0
+def schedule_changed(generation_schedule, live_schedule):
+    return len(live_schedule.change_points()) > 1 or live_schedule.base_point[0] != generation_schedule.base_point[0]
+
+
+# Function to expand block records into the power of every slot
+def slot_powers(blocks, slot_starts):
+    block_starts = [block["Ora de Inceput"] for block in blocks]
+    return np.array([blocks[bisect_right(block_starts, start) - 1]["Punct de bază [MW]"] for start in slot_starts])
+
+
+def test_live_schedule_matches_the_reference_row_by_row():
+    rng = random.Random(20241208)
+    for _ in range(300):
+        days = rng.randint(1, 3)
+        schedule = make_schedule(days, rng, base_points=EXACT_BASE_POINTS)
+        orders = make_orders(days, rng.randint(0, 60), rng, quantities=EXACT_QUANTITIES)
+        expected, expected_changed = reference_blocks(schedule, orders)
+        live_schedule = schedule.apply_orders(orders)
+        assert live_schedule.to_block_records() == expected, orders
+        assert schedule_changed(schedule, live_schedule) == expected_changed
+
+
+def test_decimal_quantities_match_the_reference_slot_by_slot():
+    # Adding order by order leaves different last bits than the cumulative sum, which can split
+    # a block of the reference in two, so only the power of every slot is compared here
+    rng = random.Random(20241209)
+    for _ in range(300):
+        days = rng.randint(1, 3)
+        schedule = make_schedule(days, rng)
+        orders = make_orders(days, rng.randint(0, 60), rng)
+        expected, _ = reference_blocks(schedule, orders)
+        slot_starts = [record["Ora de Inceput"] for record in schedule.to_records()]
+        actual = schedule.apply_orders(orders).to_block_records()
+        assert np.allclose(slot_powers(actual, slot_starts), slot_powers(expected, slot_starts)), orders
+
+
+def test_flat_schedule_without_orders_is_unchanged():
+    schedule = QuarterHourSchedule.for_local_days(date(2024, 12, 8), date(2024, 12, 9), 4.3)
+    expected, expected_changed = reference_blocks(schedule, [])
+    live_schedule = schedule.apply_orders([])
+    assert live_schedule.to_block_records() == expected
+    assert len(expected) == 1
+    assert not expected_changed
+    assert not schedule_changed(schedule, live_schedule)
+
+
+def test_orders_in_both_autumn_dst_hours_land_on_their_own_slots():
+    # 2024-10-27 has 100 slots, 03:00-04:00 local happens twice
+    schedule = QuarterHourSchedule.for_local_days(date(2024, 10, 27), date(2024, 10, 27), 4.3)
+    orders = [
+        # 00:00Z is the first 03:00 local (summer time), slots 12-13
+        make_order(datetime(2024, 10, 27, 0, 0), datetime(2024, 10, 27, 0, 30), "Crestere", 1),
+        # 01:00Z is the second 03:00 local (winter time), slots 16-17
+        make_order(datetime(2024, 10, 27, 1, 0), datetime(2024, 10, 27, 1, 30), "Scadere", 2),
+    ]
+    assert len(schedule) == 100
+    assert orders[0]["Ora de Start"] == orders[1]["Ora de Start"] == "2024-10-27 03:00:00"
+    expected = np.full(100, 4.3)
+    expected[12:14] += 1
+    expected[16:18] -= 2
+    assert np.allclose(schedule.apply_orders(orders).base_point, expected)
+    tracker = LiveScheduleTracker()
+    tracker.update(schedule, orders[:1])
+    tracker.update(schedule, orders)
+    assert np.allclose(tracker.live_schedule.base_point, expected)
@@ -0,0 +1,33 @@
+"""
+The damas loggers leave the logging setup of the host process alone.
+
+Run with:
+    python -m pytest -q
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter, the damas logger is configured once per process
+SCRIPT = """
+import io
+import logging
+
+host = logging.StreamHandler(io.StringIO())
+logging.getLogger().addHandler(host)
+from damas.log import get_logger
+
+get_logger("first").warning("to stderr")
+get_logger("second")
+assert logging.getLogger().handlers == [host]
+assert not host.stream.closed and host.stream.getvalue() == ""
+assert len(logging.getLogger("damas").handlers) == 1
+"""
+
+
+def test_get_logger_keeps_the_host_handlers():
+    result = subprocess.run([sys.executable, "-c", SCRIPT], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert "level=WARNING logger=damas.first to stderr" in result.stderr
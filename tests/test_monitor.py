@@ -0,0 +1,68 @@
+"""
+The Unix socket events of monitor.py, followed by damas.monitor_events.MonitorSubscriber.
+
+Run with:
+    python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from damas.monitor_events import MonitorSubscriber
+from damas.order_delta import diff_orders
+from monitor import DispatchMonitor, UnixSocketSink, order_event
+
+ORDER = {
+    "Ora de Start": "2024-12-08 10:00:00",
+    "Ora de Sfarsit": "2024-12-08 10:30:00",
+    "Ora de Start UTC": "2024-12-08T08:00:00Z",
+    "Ora de Sfarsit UTC": "2024-12-08T08:30:00Z",
+    "Directia": "Crestere",
+    "Cantitatea": "2",
+}
+
+
+def dispatch_data(orders):
+    return {
+        "date_from": date(2024, 12, 8),
+        "date_to": date(2024, 12, 9),
+        "orders_available": bool(orders),
+        "orders": orders,
+        "orders_changed": False,
+        "live_schedule": None,
+    }
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+def test_client_connecting_during_a_publish_sees_each_order_once():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "monitor.sock")
+        old, new = dispatch_data([]), dispatch_data([ORDER])
+        monitor = DispatchMonitor(("a", "b"), [])
+        monitor.publish(order_event("dispatch_orders_snapshot", old), old)
+        sink = UnixSocketSink(path, welcome=monitor.snapshot_event, lock=monitor.publish_lock)
+        monitor.sinks.append(sink)
+        subscriber = MonitorSubscriber(path, reconnect_delay=0.1)
+        try:
+            with monitor.publish_lock:
+                # The subscriber connects while the change is being published
+                subscriber.start()
+                time.sleep(0.2)
+                monitor.publish(order_event("dispatch_orders_changed", new, delta=diff_orders([], [ORDER])), new)
+            assert wait_for(lambda: subscriber.snapshot() is not None)
+            time.sleep(0.2)
+            assert subscriber.snapshot().error is None
+            assert subscriber.snapshot().data["orders"] == [ORDER]
+        finally:
+            subscriber.stop(timeout=1)
+            sink.close()
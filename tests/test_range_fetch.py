@@ -0,0 +1,71 @@
+"""
+Merging and fetching the per-day reports of damas.range_fetch.
+
+Run with:
+    python -m pytest -q
+"""
+import os
+import sys
+from datetime import date, datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from damas import client as damas_client
+from damas.range_fetch import fetch_month_dispatch_orders, fetch_orders_range, merge_orders
+from synthetic_documents import dispatch_orders_document
+
+
+def order(start, end, direction="Crestere", quantity="2"):
+    return {
+        "Ora de Start": start.replace("T", " ").rstrip("Z"),
+        "Ora de Sfarsit": end.replace("T", " ").rstrip("Z"),
+        "Ora de Start UTC": start,
+        "Ora de Sfarsit UTC": end,
+        "Directia": direction,
+        "Cantitatea": quantity,
+    }
+
+
+MIDNIGHT = order("2024-07-01T21:45:00Z", "2024-07-01T22:15:00Z")
+MORNING = order("2024-07-02T06:00:00Z", "2024-07-02T06:30:00Z")
+
+
+def test_order_spanning_midnight_is_kept_once():
+    assert merge_orders([[MIDNIGHT], [MIDNIGHT, MORNING]]) == [MIDNIGHT, MORNING]
+
+
+def test_identical_orders_of_one_day_are_all_kept():
+    # One response may list the same order twice; both are applied, as in a single-range fetch
+    assert merge_orders([[MORNING, MORNING]]) == [MORNING, MORNING]
+    assert merge_orders([[MIDNIGHT, MIDNIGHT], [MIDNIGHT]]) == [MIDNIGHT, MIDNIGHT]
+    assert merge_orders([[MIDNIGHT], [MIDNIGHT, MIDNIGHT]]) == [MIDNIGHT, MIDNIGHT]
+
+
+def test_range_is_fetched_one_day_at_a_time():
+    requested = []
+    responses = {"2024-07-01": [MIDNIGHT], "2024-07-02": [MIDNIGHT, MORNING]}
+
+    def fetch_day(day_from, day_to):
+        requested.append((day_from, day_to))
+        return day_from if day_from in responses else None
+
+    orders = fetch_orders_range(fetch_day, responses.get, date(2024, 7, 1), date(2024, 7, 3), max_workers=2)
+    assert sorted(requested) == [("2024-07-01", "2024-07-01"), ("2024-07-02", "2024-07-02"), ("2024-07-03", "2024-07-03")]
+    assert orders == [MIDNIGHT, MORNING]
+
+
+def test_month_of_dispatch_orders_uses_the_access_codes(monkeypatch):
+    requests = []
+
+    def fetch_report(fid, date_from, date_to, username, password, **kwargs):
+        requests.append((fid, date_from, date_to, username, password))
+        return dispatch_orders_document(2, first_day=datetime.strptime(date_from, "%Y-%m-%d"))
+
+    monkeypatch.setattr(damas_client, "fetch_report", fetch_report)
+    orders = fetch_month_dispatch_orders(2024, 2, ("user", "secret"), max_workers=4)
+    assert sorted(request[1] for request in requests) == [f"2024-02-{day:02d}" for day in range(1, 30)]
+    assert {request[3:] for request in requests} == {("user", "secret")}
+    assert {request[0] for request in requests} == {"DISPATCH_ORDERS_MANUAL_DOWNLOAD_XML_OUT"}
+    assert len(orders) == 2 * 29
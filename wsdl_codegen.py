@@ -0,0 +1,428 @@
+"""
+Generate damas/operations.py, typed request builders and response decoders for DAMAS, from
+the local WSDL copy in wsdl/damas.wsdl.
+
+The generated module only needs lxml, so the dashboard never imports zeep nor parses the
+WSDL and its schema at startup; the schema is read once, here. Rerun after updating the WSDL:
+
+    python wsdl_codegen.py            # write damas/operations.py
+    python wsdl_codegen.py --check    # exit status 1 if damas/operations.py is out of date
+    python wsdl_codegen.py --list     # print the operations and their messages
+
+Supported schema subset: named and anonymous complexTypes with a sequence of elements
+(minOccurs/maxOccurs), xsd:any, attributes and simpleContent extensions of the builtin types
+in BUILTIN_TYPES.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import keyword
+import os
+import re
+import sys
+from typing import NamedTuple
+
+from lxml import etree
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+WSDL_PATH = os.path.join(ROOT, "wsdl", "damas.wsdl")
+OUTPUT_PATH = os.path.join(ROOT, "damas", "operations.py")
+
+WSDL_NS = "http://schemas.xmlsoap.org/wsdl/"
+SOAP12_NS = "http://schemas.xmlsoap.org/wsdl/soap12/"
+XSD_NS = "http://www.w3.org/2001/XMLSchema"
+NAMESPACES = {"wsdl": WSDL_NS, "soap12": SOAP12_NS, "xsd": XSD_NS}
+
+# The prefix the SOAP envelopes of damas/soap_envelope.py bind to the target namespace
+PREFIX = "wse"
+
+# XSD type: (Python annotation, parse expression, format expression)
+BUILTIN_TYPES = {
+    "string": ("str", "str", "str"),
+    "int": ("int", "int", "str"),
+    "long": ("int", "int", "str"),
+    "decimal": ("float", "float", "repr"),
+    "double": ("float", "float", "repr"),
+    "boolean": ("bool", "_parse_boolean", "_format_boolean"),
+    "date": ("date", "date.fromisoformat", "str"),
+    "dateTime": ("datetime", "_parse_datetime", "_format_datetime"),
+}
+
+
+class Field(NamedTuple):
+    name: str
+    tag: str | None
+    kind: str  # "builtin", "complex" or "any"
+    type: str | None
+    optional: bool
+    repeated: bool
+
+
+class Attribute(NamedTuple):
+    name: str
+    xml_name: str
+    type: str
+    required: bool
+
+
+class ComplexType(NamedTuple):
+    name: str
+    fields: list
+    attributes: list
+    simple_base: str | None
+
+
+class Operation(NamedTuple):
+    name: str
+    action: str
+    input_element: str
+    output_element: str
+
+
+class Service(NamedTuple):
+    namespace: str
+    address: str
+    types: dict
+    elements: dict
+    operations: list
+
+
+# Function to turn an XML name into a Python identifier, e.g. "RQState" into "rq_state"
+def snake_case(name):
+    name = re.sub(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])", "_", name).replace("-", "_").replace(".", "_").lower()
+    return name + "_" if keyword.iskeyword(name) else name
+
+
+def _resolve(node, qname):
+    prefix, _, name = qname.rpartition(":")
+    return node.nsmap.get(prefix or None), name
+
+
+def _read_attribute(node):
+    xml_name = node.get("name")
+    return Attribute(snake_case(xml_name), xml_name, _resolve(node, node.get("type", "xsd:string"))[1], node.get("use") == "required")
+
+
+def _read_complex_type(name, node, types):
+    """
+    Read a complexType into `types`, anonymous nested types included, and return its name.
+    """
+    fields = []
+    attributes = [_read_attribute(attribute) for attribute in node.iterfind("xsd:attribute", NAMESPACES)]
+    simple_base = None
+
+    extension = node.find("xsd:simpleContent/xsd:extension", NAMESPACES)
+    if extension is not None:
+        namespace, simple_base = _resolve(extension, extension.get("base"))
+        if namespace != XSD_NS or simple_base not in BUILTIN_TYPES:
+            raise ValueError(f"{name}: unsupported simpleContent base {extension.get('base')}")
+        attributes += [_read_attribute(attribute) for attribute in extension.iterfind("xsd:attribute", NAMESPACES)]
+
+    for sequence in node.iterfind("xsd:sequence", NAMESPACES):
+        for child in sequence:
+            if not isinstance(child.tag, str):
+                continue
+            optional = child.get("minOccurs", "1") == "0"
+            repeated = child.get("maxOccurs", "1") not in ("0", "1")
+            if child.tag == f"{{{XSD_NS}}}any":
+                fields.append(Field("elements", None, "any", None, True, True))
+                continue
+            if child.tag != f"{{{XSD_NS}}}element":
+                raise ValueError(f"{name}: unsupported particle {child.tag}")
+            tag = child.get("name")
+            if child.get("type") is None:
+                nested = child.find("xsd:complexType", NAMESPACES)
+                if nested is None:
+                    raise ValueError(f"{name}.{tag}: element without a type")
+                type_name = _read_complex_type(f"{name}{tag}", nested, types)
+                fields.append(Field(snake_case(tag), tag, "complex", type_name, optional, repeated))
+                continue
+            namespace, type_name = _resolve(child, child.get("type"))
+            kind = "builtin" if namespace == XSD_NS else "complex"
+            if kind == "builtin" and type_name not in BUILTIN_TYPES:
+                raise ValueError(f"{name}.{tag}: unsupported type {child.get('type')}")
+            fields.append(Field(snake_case(tag), tag, kind, type_name, optional, repeated))
+
+    types[name] = ComplexType(name, fields, attributes, simple_base)
+    return name
+
+
+# Function to read the operations and their message types out of a WSDL file
+def read_wsdl(path=WSDL_PATH):
+    definitions = etree.parse(path).getroot()
+    namespace = definitions.get("targetNamespace")
+
+    types = {}
+    elements = {}
+    for schema in definitions.iterfind("wsdl:types/xsd:schema", NAMESPACES):
+        for node in schema.iterfind("xsd:complexType", NAMESPACES):
+            _read_complex_type(node.get("name"), node, types)
+        for node in schema.iterfind("xsd:element", NAMESPACES):
+            name = node.get("name")
+            if node.get("type") is not None:
+                elements[name] = _resolve(node, node.get("type"))[1]
+            else:
+                elements[name] = _read_complex_type(name, node.find("xsd:complexType", NAMESPACES), types)
+
+    messages = {
+        message.get("name"): _resolve(message, message.find("wsdl:part", NAMESPACES).get("element"))[1]
+        for message in definitions.iterfind("wsdl:message", NAMESPACES)
+    }
+    actions = {
+        operation.get("name"): operation.find("soap12:operation", NAMESPACES).get("soapAction")
+        for operation in definitions.iterfind("wsdl:binding/wsdl:operation", NAMESPACES)
+    }
+    operations = []
+    for operation in definitions.iterfind("wsdl:portType/wsdl:operation", NAMESPACES):
+        name = operation.get("name")
+        input_message = _resolve(operation, operation.find("wsdl:input", NAMESPACES).get("message"))[1]
+        output_message = _resolve(operation, operation.find("wsdl:output", NAMESPACES).get("message"))[1]
+        operations.append(Operation(name, actions.get(name, f"{namespace}/{name}"), messages[input_message], messages[output_message]))
+
+    address = definitions.find("wsdl:service/wsdl:port/soap12:address", NAMESPACES)
+    return Service(namespace, "" if address is None else address.get("location"), types, elements, operations)
+
+
+def _annotation(field):
+    annotation = BUILTIN_TYPES[field.type][0] if field.kind == "builtin" else field.type if field.kind == "complex" else "etree._Element"
+    if field.repeated:
+        return f"list[{annotation}]"
+    return f"{annotation} | None" if field.optional else annotation
+
+
+def _encode_expression(field, accessor):
+    if field.kind == "any":
+        return f'"".join(etree.tostring(item, encoding="unicode") for item in {accessor})'
+    if field.kind == "builtin":
+        encode = lambda item: f'_simple("{field.tag}", {BUILTIN_TYPES[field.type][2]}({item}))'
+    else:
+        encode = lambda item: f'_encode_{field.type}("{field.tag}", {item})'
+    if field.repeated:
+        return f'"".join({encode("item")} for item in {accessor})'
+    if field.optional:
+        return f'("" if {accessor} is None else {encode(accessor)})'
+    return encode(accessor)
+
+
+def _decode_expression(field, namespace, sibling_tags):
+    tag = f"{{{namespace}}}{field.tag}"
+    if field.kind == "any":
+        if not sibling_tags:
+            return "list(element)"
+        return f"[child for child in element if child.tag not in {tuple(f'{{{namespace}}}{name}' for name in sibling_tags)!r}]"
+    if field.kind == "builtin":
+        parse = BUILTIN_TYPES[field.type][1]
+        if field.repeated:
+            return f'[{parse}(child.text or "") for child in element.iterfind("{tag}")]'
+        return f'_value(element.find("{tag}"), {parse})'
+    if field.repeated:
+        return f'[_decode_{field.type}(child) for child in element.iterfind("{tag}")]'
+    return f'_child(element.find("{tag}"), _decode_{field.type})'
+
+
+def _attribute_parse(attribute):
+    return BUILTIN_TYPES.get(attribute.type, BUILTIN_TYPES["string"])[1]
+
+
+def _generate_type(complex_type, namespace):
+    lines = [f"class {complex_type.name}(NamedTuple):", f'    """{complex_type.name} of the DAMAS schema."""']
+    members = []
+    if complex_type.simple_base is not None:
+        members.append(("value", BUILTIN_TYPES[complex_type.simple_base][0], False, False))
+    members += [(attribute.name, BUILTIN_TYPES.get(attribute.type, BUILTIN_TYPES["string"])[0] + ("" if attribute.required else " | None"),
+                 not attribute.required, False) for attribute in complex_type.attributes]
+    members += [(field.name, _annotation(field), field.optional, field.repeated) for field in complex_type.fields]
+    # Defaults only where every following member has one too
+    defaulted = len(members)
+    while defaulted > 0 and (members[defaulted - 1][2] or members[defaulted - 1][3]):
+        defaulted -= 1
+    for index, (name, annotation, _, repeated) in enumerate(members):
+        default = "" if index < defaulted else " = ()" if repeated else " = None"
+        lines.append(f"    {name}: {annotation}{default}")
+
+    attributes = " + ".join(
+        f'_attribute("{attribute.xml_name}", value.{attribute.name})' for attribute in complex_type.attributes
+    ) or '""'
+    lines += ["", "", f"def _encode_{complex_type.name}(tag, value):"]
+    if complex_type.simple_base is not None:
+        content = f"escape({BUILTIN_TYPES[complex_type.simple_base][2]}(value.value))"
+    elif len(complex_type.fields) == 1:
+        content = _encode_expression(complex_type.fields[0], f"value.{complex_type.fields[0].name}")
+    elif complex_type.fields:
+        content = '"".join((\n' + "".join(f"        {_encode_expression(field, f'value.{field.name}')},\n" for field in complex_type.fields) + "    ))"
+    else:
+        content = '""'
+    lines.append(f"    return _wrap(tag, {content}, {attributes})")
+
+    lines += ["", "", f"def _decode_{complex_type.name}(element):"]
+    if not members:
+        lines.append(f"    return {complex_type.name}()")
+        return lines
+    lines.append(f"    return {complex_type.name}(")
+    if complex_type.simple_base is not None:
+        lines.append(f'        value={BUILTIN_TYPES[complex_type.simple_base][1]}(element.text or ""),')
+    for attribute in complex_type.attributes:
+        lines.append(f'        {attribute.name}=_value_of(element.get("{attribute.xml_name}"), {_attribute_parse(attribute)}),')
+    tags = [field.tag for field in complex_type.fields if field.tag is not None]
+    for field in complex_type.fields:
+        lines.append(f"        {field.name}={_decode_expression(field, namespace, tags)},")
+    lines.append("    )")
+    return lines
+
+
+def _generate_operation(operation, service):
+    function = snake_case(operation.name)
+    input_type = service.elements[operation.input_element]
+    output_type = service.elements[operation.output_element]
+    output_tag = f"{{{service.namespace}}}{operation.output_element}"
+    return [
+        f"# Function to serialize a {operation.name} request into the content of soap:Body",
+        f"def encode_{function}(request):",
+        '    """',
+        f"    Args:",
+        f"        request ({input_type}): The request.",
+        "",
+        "    Returns:",
+        f"        str: The {PREFIX}:{operation.input_element} element, for soap_envelope.build_envelope.",
+        '    """',
+        f'    return _encode_{input_type}("{operation.input_element}", request)',
+        "",
+        "",
+        f"# Function to decode the {operation.output_element} out of a SOAP response",
+        f"def decode_{function}_response(content):",
+        '    """',
+        "    Args:",
+        "        content (bytes): The SOAP response.",
+        "",
+        "    Returns:",
+        f"        {output_type}: The decoded response.",
+        "",
+        "    Raises:",
+        f"        ValueError: The response holds no {operation.output_element}.",
+        '    """',
+        "    root = etree.fromstring(content)",
+        f'    element = root if root.tag == "{output_tag}" else root.find(".//{output_tag}")',
+        "    if element is None:",
+        f'        raise ValueError("No {operation.output_element} in the response.")',
+        f"    return _decode_{output_type}(element)",
+    ]
+
+
+RUNTIME_HELPERS = '''
+def _parse_boolean(text):
+    return text.strip() in ("true", "1")
+
+
+def _format_boolean(value):
+    return "true" if value else "false"
+
+
+def _parse_datetime(text):
+    return datetime.fromisoformat(text.strip().replace("Z", "+00:00"))
+
+
+def _format_datetime(value):
+    return value.isoformat().replace("+00:00", "Z") if isinstance(value, datetime) else str(value)
+
+
+def _wrap(tag, content, attributes):
+    if not content:
+        return f"<{PREFIX}:{tag}{attributes}/>"
+    return f"<{PREFIX}:{tag}{attributes}>{content}</{PREFIX}:{tag}>"
+
+
+def _simple(tag, text):
+    return f"<{PREFIX}:{tag}>{escape(text)}</{PREFIX}:{tag}>"
+
+
+def _attribute(name, value):
+    return "" if value is None else f" {name}={quoteattr(str(value))}"
+
+
+def _value_of(text, parse):
+    return None if text is None else parse(text)
+
+
+def _value(child, parse):
+    return None if child is None else parse(child.text or "")
+
+
+def _child(child, decode):
+    return None if child is None else decode(child)
+'''
+
+
+# Function to generate the source of damas/operations.py
+def generate(service, wsdl_path=WSDL_PATH):
+    with open(wsdl_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    relative_path = os.path.relpath(wsdl_path, ROOT).replace(os.sep, "/")
+    lines = [
+        f"# Generated by wsdl_codegen.py from {relative_path} (sha256 {digest}), do not edit.",
+        '"""',
+        "Typed request builders and response decoders for the DAMAS SOAP operations.",
+        "",
+        "Operations: " + ", ".join(operation.name for operation in service.operations) + ".",
+        f"Request builders return the body element with the `{PREFIX}` prefix that soap_envelope binds",
+        "to the DAMAS namespace; decoders take the raw response bytes.",
+        '"""',
+        "from __future__ import annotations",
+        "",
+        "from datetime import date, datetime",
+        "from typing import NamedTuple",
+        "from xml.sax.saxutils import escape, quoteattr",
+        "",
+        "from lxml import etree",
+        "",
+        f'NAMESPACE = "{service.namespace}"',
+        f'PREFIX = "{PREFIX}"',
+        f'ENDPOINT = "{service.address}"',
+        "SOAP_ACTIONS = {",
+        *(f'    "{operation.name}": "{operation.action}",' for operation in service.operations),
+        "}",
+        "",
+    ]
+    lines += RUNTIME_HELPERS.strip("\n").split("\n")
+    for complex_type in service.types.values():
+        lines += ["", ""] + _generate_type(complex_type, service.namespace)
+    for operation in service.operations:
+        lines += ["", ""] + _generate_operation(operation, service)
+    return "\n".join(lines).rstrip("\n") + "\n"
+
+
+def describe(service):
+    for operation in service.operations:
+        for label, element in (("Input", operation.input_element), ("Output", operation.output_element)):
+            complex_type = service.types[service.elements[element]]
+            members = [f"{field.name}: {_annotation(field)}" for field in complex_type.fields]
+            print(f"{operation.name} {label}: {element}({', '.join(members)})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the DAMAS operation bindings from the local WSDL copy.")
+    parser.add_argument("--wsdl", default=WSDL_PATH)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--check", action="store_true", help="Only check that the output is up to date.")
+    parser.add_argument("--list", action="store_true", help="Print the operations and exit.")
+    args = parser.parse_args(argv)
+
+    service = read_wsdl(args.wsdl)
+    if args.list:
+        describe(service)
+        return 0
+    source = generate(service, args.wsdl)
+    if args.check:
+        current = open(args.output, encoding="utf-8").read() if os.path.exists(args.output) else None
+        if current != source:
+            print(f"{args.output} is out of date, run python wsdl_codegen.py")
+            return 1
+        return 0
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(source)
+    print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())